@@ -1,14 +1,16 @@
 """FastMCP Server with tool implementations"""
 
 from fastmcp import FastMCP
+from tool_metrics import instrument
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize MCP server
+# Initialize MCP server, with call counts and latency for every tool
 mcp = FastMCP("Ollama Tools Server")
+metrics = instrument(mcp)
 
 @mcp.tool()
 async def calculator(expression: str) -> str:
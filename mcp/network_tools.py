@@ -7,22 +7,107 @@ Provides ping, DNS lookup, and port checking capabilities for network engineers.
 import subprocess
 import socket
 import asyncio
+import errno
+import ipaddress
 import logging
-from fastmcp import FastMCP
+import re
+import struct
+import time
+from fastmcp import FastMCP, Context
+from tool_cache import cached_tool, cache_stats
+from tool_metrics import instrument
+
+# dnspython is only needed for the DNS tools; the other tools work without it
+try:
+    import dns.asyncresolver
+    import dns.resolver
+except ImportError:
+    dns = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize MCP server
+# Initialize MCP server, with call counts and latency for every tool
 mcp = FastMCP("Network Tools")
+metrics = instrument(mcp)
+
+# ICMP echo message types (IPv4 and IPv6)
+ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY = 8, 0
+ICMPV6_ECHO_REQUEST, ICMPV6_ECHO_REPLY = 128, 129
+
+# Batch ping limits
+PING_MANY_MAX_HOSTS = 1000
+PING_MANY_CONCURRENCY = 256
+PING_INTERVAL = 0.5
+PING_REPLY_TIMEOUT = 2.0
+
+# DNS resolver settings
+DNS_CACHE_SIZE = 4096
+DNS_MANY_MAX_NAMES = 500
+DNS_MANY_CONCURRENCY = 100
+
+# Port sweep limits
+PORT_SWEEP_MAX_PROBES = 100000
+PORT_SWEEP_CONCURRENCY = 1000
+PORT_SWEEP_PROGRESS_EVERY = 1000
+
+# Most sockets (or ping processes) open at once across every ping_many and port_sweep call
+MAX_OPEN_SOCKETS = 1000
+
+# Service names for common TCP ports, looked up from this table instead of the system services database
+TCP_SERVICES = {
+    20: "ftp-data", 21: "ftp", 22: "ssh", 23: "telnet", 25: "smtp", 49: "tacacs", 53: "domain",
+    80: "http", 88: "kerberos", 110: "pop3", 111: "sunrpc", 135: "msrpc", 139: "netbios-ssn",
+    143: "imap", 179: "bgp", 389: "ldap", 443: "https", 445: "microsoft-ds", 465: "smtps",
+    514: "shell", 515: "printer", 587: "submission", 636: "ldaps", 646: "ldp", 830: "netconf-ssh",
+    873: "rsync", 989: "ftps-data", 990: "ftps", 993: "imaps", 995: "pop3s", 1433: "ms-sql-s",
+    1521: "oracle", 1723: "pptp", 1812: "radius", 2049: "nfs", 2375: "docker", 2376: "docker-tls",
+    3128: "squid", 3306: "mysql", 3389: "ms-wbt-server", 5060: "sip", 5061: "sips", 5432: "postgresql",
+    5900: "vnc", 5985: "wsman", 5986: "wsmans", 6379: "redis", 6443: "kubernetes-api", 6653: "openflow",
+    8000: "http-alt", 8080: "http-alt", 8443: "https-alt", 8888: "http-alt", 9090: "prometheus",
+    9100: "node-exporter", 9200: "elasticsearch", 9339: "gnmi", 11211: "memcache", 27017: "mongodb",
+    57400: "gnmi-nokia",
+}
+
+# Seconds to reuse a tool's result for identical calls (0 = only share calls already running).
+# DNS answers are already cached by the resolver for their own TTL
+CACHE_TTLS = {
+    "ping": 10,
+    "ping_many": 10,
+    "dns_lookup": 0,
+    "dns_lookup_many": 0,
+    "check_port": 10,
+    "port_sweep": 30,
+}
+
+# Shared async resolver and the lookups currently waiting on an answer
+_dns_resolver = None
+_dns_in_flight = {}
+
+
+async def _report(ctx, progress: float, total: float, message: str = None) -> None:
+    """
+    Send a progress notification, with an optional partial result as its message, to the MCP client.
+
+    A client that has gone away must not break the diagnostic, so failures are only logged.
+    """
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(progress, total, message)
+    except Exception as e:
+        logger.debug(f"Could not send progress: {e}")
 
 
 @mcp.tool()
-async def ping(hostname: str, count: int = 4) -> str:
+@cached_tool(ttl=CACHE_TTLS["ping"])
+async def ping(hostname: str, count: int = 4, ctx: Context = None) -> str:
     """
     Check if a host is reachable using ICMP ping.
 
+    Each reply is streamed to the client as it arrives, and the ping can be cancelled part way.
+
     Args:
         hostname: The hostname or IP address to ping (e.g., "google.com", "8.8.8.8")
         count: Number of ping packets to send (default: 4)
@@ -30,6 +115,8 @@ async def ping(hostname: str, count: int = 4) -> str:
     Returns:
         Ping results including latency and packet loss information
     """
+    process = None
+    replies = 0
     try:
         logger.info(f"Pinging {hostname} with {count} packets")
 
@@ -39,8 +126,22 @@ async def ping(hostname: str, count: int = 4) -> str:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=15)
-        output = stdout.decode()
+
+        # Read the output line by line so each reply can be passed on straight away
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 15
+        lines = []
+        while True:
+            line = await asyncio.wait_for(process.stdout.readline(), timeout=max(0, deadline - loop.time()))
+            if not line:
+                break
+            text = line.decode().rstrip()
+            lines.append(text)
+            if "bytes from" in text:
+                replies += 1
+                await _report(ctx, replies, count, text)
+        await process.wait()
+        output = "\n".join(lines)
 
         if process.returncode == 0:
             # Parse output for summary
@@ -55,16 +156,321 @@ async def ping(hostname: str, count: int = 4) -> str:
             return result
 
     except asyncio.TimeoutError:
-        error_msg = f"✗ Ping to {hostname} timed out"
+        error_msg = f"✗ Ping to {hostname} timed out ({replies} of {count} replies received)"
         logger.error(error_msg)
         return error_msg
+    except asyncio.CancelledError:
+        logger.info(f"Ping to {hostname} cancelled after {replies} replies")
+        raise
     except Exception as e:
         error_msg = f"✗ Error pinging {hostname}: {str(e)}"
         logger.error(error_msg)
         return error_msg
+    finally:
+        # Timed out or cancelled: don't leave the ping process running
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071) of an ICMP message."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _literal_address(host: str):
+    """
+    Return (family, sockaddr) for an IP address literal, or None for a hostname.
+
+    getaddrinfo runs in a thread pool, so skipping it for plain addresses keeps big
+    sweeps on the event loop. Scoped IPv6 addresses (fe80::1%eth0) still go through it.
+    """
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    if address.version == 4:
+        return socket.AF_INET, (str(address), 0)
+    if address.scope_id:
+        return None
+    return socket.AF_INET6, (str(address), 0, 0, 0)
+
+
+def _socket_limit() -> int:
+    """How many sockets the tools may hold at once, kept well under the process's open-file limit."""
+    try:
+        import resource
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft_limit != resource.RLIM_INFINITY:
+            return max(16, min(MAX_OPEN_SOCKETS, soft_limit - 128))
+    except ImportError:
+        pass
+    return MAX_OPEN_SOCKETS
+
+
+# One budget for the whole server: the open-file limit is per process, not per call,
+# so concurrent sweeps and ping batches take their sockets from the same pool
+_socket_slots = asyncio.Semaphore(_socket_limit())
+
+
+def _open_ping_socket(family: int):
+    """
+    Open an unprivileged ICMP datagram socket, or return None if the OS doesn't allow it.
+
+    Linux only allows these for groups listed in net.ipv4.ping_group_range; macOS always does.
+    Running out of file descriptors is raised, not treated as "not allowed".
+    """
+    protocol = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+    try:
+        sock = socket.socket(family, socket.SOCK_DGRAM, protocol)
+    except OSError as e:
+        if e.errno in (errno.EMFILE, errno.ENFILE):
+            raise
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+async def _probe_with_socket(sock, result: dict, address: tuple, count: int) -> None:
+    """Send count echo requests on an ICMP datagram socket and record each reply's RTT."""
+    loop = asyncio.get_running_loop()
+    ipv4 = sock.family == socket.AF_INET
+    request_type = ICMP_ECHO_REQUEST if ipv4 else ICMPV6_ECHO_REQUEST
+    reply_type = ICMP_ECHO_REPLY if ipv4 else ICMPV6_ECHO_REPLY
+    sent_at = {}
+    all_replied = asyncio.Event()
+
+    def on_readable():
+        while True:
+            try:
+                packet, source = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError, OSError):
+                return
+            # macOS includes the IPv4 header in what we read; Linux doesn't
+            if ipv4 and packet and packet[0] >> 4 == 4:
+                packet = packet[(packet[0] & 0x0F) * 4:]
+            if len(packet) < 8 or source[0] != address[0]:
+                continue
+            icmp_type, _, _, _, sequence = struct.unpack("!BBHHH", packet[:8])
+            # The kernel rewrites the identifier to the socket's own, so match on sequence only
+            if icmp_type != reply_type or sequence not in sent_at:
+                continue
+            result["rtts"].append((time.perf_counter() - sent_at.pop(sequence)) * 1000)
+            result["received"] += 1
+            if result["received"] == count:
+                all_replied.set()
+
+    loop.add_reader(sock.fileno(), on_readable)
+    try:
+        for sequence in range(count):
+            header = struct.pack("!BBHHH", request_type, 0, 0, 0, sequence)
+            payload = b"\x00" * 56
+            if ipv4:
+                checksum = _icmp_checksum(header + payload)
+                header = struct.pack("!BBHHH", request_type, 0, checksum, 0, sequence)
+            sent_at[sequence] = time.perf_counter()
+            sock.sendto(header + payload, address)
+            result["sent"] += 1
+            if sequence < count - 1:
+                await asyncio.sleep(PING_INTERVAL)
+        try:
+            await asyncio.wait_for(all_replied.wait(), timeout=PING_REPLY_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        loop.remove_reader(sock.fileno())
+
+
+async def _probe_with_subprocess(result: dict, address: str, count: int) -> None:
+    """Fallback for hosts where ICMP sockets aren't allowed: run the ping command and parse it."""
+    process = await asyncio.create_subprocess_exec(
+        "ping", "-c", str(count), "-W", str(int(PING_REPLY_TIMEOUT)), address,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, _ = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+    output = stdout.decode()
+
+    # Linux: "3 packets transmitted, 3 received"  macOS: "3 packets transmitted, 3 packets received"
+    counts = re.search(r"(\d+) packets transmitted, (\d+) (?:packets )?received", output)
+    if counts:
+        result["sent"], result["received"] = int(counts.group(1)), int(counts.group(2))
+    # "rtt min/avg/max/mdev = 0.1/0.2/0.3/0.0 ms" (or "round-trip ..." on macOS)
+    rtt = re.search(r"= ([\d.]+)/([\d.]+)/([\d.]+)", output)
+    if rtt:
+        result["min_ms"], result["avg_ms"], result["max_ms"] = (float(value) for value in rtt.groups())
+
+
+async def _ping_host(host: str, count: int, semaphore: asyncio.Semaphore, result: dict) -> None:
+    """Resolve one host and ping it, filling in result as replies arrive."""
+    async with semaphore:
+        literal = _literal_address(host)
+        if literal:
+            family, address = literal
+        else:
+            try:
+                addresses = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_DGRAM)
+            except socket.gaierror:
+                result["error"] = "could not resolve hostname"
+                return
+            family, _, _, _, address = addresses[0]
+        result["address"] = address[0]
+
+        async with _socket_slots:
+            await _probe_host(result, family, address, count)
+
+
+async def _probe_host(result: dict, family: int, address: tuple, count: int) -> None:
+    """Ping one resolved address, with an ICMP socket if allowed or else the ping command."""
+    sock = None
+    try:
+        sock = _open_ping_socket(family)
+        if sock is not None:
+            result["method"] = "icmp_socket"
+            try:
+                await _probe_with_socket(sock, result, address, count)
+                return
+            except NotImplementedError:
+                # Event loops without add_reader (Windows proactor) use the fallback
+                pass
+        result["method"] = "ping_command"
+        await _probe_with_subprocess(result, address[0], count)
+    except FileNotFoundError:
+        result["error"] = "ICMP sockets not permitted and ping command not found"
+    except OSError as e:
+        result["error"] = str(e)
+    finally:
+        if sock is not None:
+            sock.close()
+
+
+def _summarize_ping(result: dict) -> dict:
+    """Turn the working state for one host into its structured result."""
+    rtts = result.pop("rtts")
+    if rtts:
+        result["min_ms"] = min(rtts)
+        result["avg_ms"] = sum(rtts) / len(rtts)
+        result["max_ms"] = max(rtts)
+    for key in ("min_ms", "avg_ms", "max_ms"):
+        if result.get(key) is not None:
+            result[key] = round(result[key], 3)
+        else:
+            result[key] = None
+    sent = result["sent"]
+    result["loss_percent"] = round(100.0 * (sent - result["received"]) / sent, 1) if sent else 100.0
+    result["reachable"] = result["received"] > 0
+    return result
 
 
 @mcp.tool()
+@cached_tool(ttl=CACHE_TTLS["ping_many"])
+async def ping_many(hosts: list[str], count: int = 3, timeout: float = 10.0, ctx: Context = None) -> dict:
+    """
+    Ping many hosts at once and report which are up, with per-host packet loss and latency.
+
+    Use this instead of calling ping once per host when checking more than a few hosts.
+    Each host's result is streamed to the client as soon as it finishes.
+
+    Args:
+        hosts: Hostnames or IP addresses to ping (e.g., ["8.8.8.8", "github.com"]), up to 1000
+        count: Number of ping packets to send to each host, 1-10 (default: 3)
+        timeout: Overall time limit in seconds for the whole batch (default: 10.0)
+
+    Returns:
+        Lists of reachable and unreachable hosts, plus per-host sent/received counts,
+        loss_percent and min/avg/max round-trip times in milliseconds
+    """
+    # Keep the order the caller gave, without duplicates
+    hosts = list(dict.fromkeys(host.strip() for host in hosts if host.strip()))
+    if not hosts:
+        return {"error": "No hosts given"}
+    if len(hosts) > PING_MANY_MAX_HOSTS:
+        return {"error": f"Too many hosts ({len(hosts)}); the limit is {PING_MANY_MAX_HOSTS} per call"}
+    count = max(1, min(count, 10))
+
+    logger.info(f"Pinging {len(hosts)} hosts with {count} packets each")
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(PING_MANY_CONCURRENCY)
+    results = {
+        host: {"host": host, "address": None, "method": None, "sent": 0, "received": 0, "rtts": [], "error": None}
+        for host in hosts
+    }
+    tasks = {asyncio.create_task(_ping_host(host, count, semaphore, results[host])): host for host in hosts}
+
+    # Pass each host on as it finishes. Whatever hasn't finished by the deadline (or when the
+    # client cancels) is cancelled; timed-out hosts are reported with what they have so far
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = set(tasks)
+    finished = 0
+    try:
+        while pending and loop.time() < deadline:
+            done, pending = await asyncio.wait(pending, timeout=deadline - loop.time(),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finished += 1
+                result = results[tasks[task]]
+                await _report(ctx, finished, len(hosts),
+                              f"{result['host']}: {result['received']}/{result['sent']} replies"
+                              + (f" ({result['error']})" if result["error"] else ""))
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    for task in pending:
+        if results[tasks[task]]["error"] is None:
+            results[tasks[task]]["error"] = "overall timeout reached"
+
+    summaries = [_summarize_ping(results[host]) for host in hosts]
+    reachable = [result["host"] for result in summaries if result["reachable"]]
+    unreachable = [result["host"] for result in summaries if not result["reachable"]]
+    logger.info(f"Ping batch done: {len(reachable)} reachable, {len(unreachable)} unreachable")
+    return {
+        "reachable": reachable,
+        "unreachable": unreachable,
+        "timed_out": bool(pending),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "results": summaries,
+    }
+
+
+def _get_dns_resolver():
+    """
+    Return the server-wide async resolver, creating it on first use.
+
+    Its LRU cache honours each record's TTL and also caches NXDOMAIN and
+    NoAnswer responses for the zone's negative-caching TTL (RFC 2308).
+    """
+    global _dns_resolver
+    if _dns_resolver is None:
+        _dns_resolver = dns.asyncresolver.Resolver()
+        _dns_resolver.cache = dns.resolver.LRUCache(DNS_CACHE_SIZE)
+    return _dns_resolver
+
+
+async def _resolve(hostname: str, record_type: str):
+    """Resolve through the shared resolver; identical lookups already in flight share one query."""
+    key = (hostname.lower().rstrip("."), record_type.upper())
+    task = _dns_in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_get_dns_resolver().resolve(hostname, record_type))
+        _dns_in_flight[key] = task
+        task.add_done_callback(lambda _: _dns_in_flight.pop(key, None))
+    # Shielded so one caller giving up doesn't cancel the query for everyone else
+    return await asyncio.shield(task)
+
+
+@mcp.tool()
+@cached_tool(ttl=CACHE_TTLS["dns_lookup"])
 async def dns_lookup(hostname: str, record_type: str = "A") -> str:
     """
     Perform DNS lookup for a hostname.
@@ -79,14 +485,10 @@ async def dns_lookup(hostname: str, record_type: str = "A") -> str:
     try:
         logger.info(f"DNS lookup for {hostname} ({record_type} records)")
 
-        # Import dns.resolver here to handle if dnspython isn't installed
-        try:
-            import dns.resolver
-        except ImportError:
+        if dns is None:
             return "Error: dnspython not installed. Run: pip install dnspython"
 
-        resolver = dns.resolver.Resolver()
-        answers = resolver.resolve(hostname, record_type)
+        answers = await _resolve(hostname, record_type)
 
         results = [f"DNS lookup for {hostname} ({record_type} records):"]
         for rdata in answers:
@@ -115,6 +517,61 @@ async def dns_lookup(hostname: str, record_type: str = "A") -> str:
 
 
 @mcp.tool()
+@cached_tool(ttl=CACHE_TTLS["dns_lookup_many"])
+async def dns_lookup_many(hostnames: list[str], record_type: str = "A") -> dict:
+    """
+    Resolve many hostnames at once.
+
+    Use this instead of calling dns_lookup once per name when checking more than a few names.
+
+    Args:
+        hostnames: Hostnames to resolve (e.g., ["github.com", "google.com"]), up to 500
+        record_type: DNS record type - A, AAAA, MX, NS, TXT, or CNAME (default: "A")
+
+    Returns:
+        Per-hostname status (ok, nxdomain, no_answer, timeout or error) with the
+        records and their remaining TTL in seconds
+    """
+    if dns is None:
+        return {"error": "dnspython not installed. Run: pip install dnspython"}
+
+    # Keep the order the caller gave, without duplicates
+    hostnames = list(dict.fromkeys(name.strip() for name in hostnames if name.strip()))
+    if not hostnames:
+        return {"error": "No hostnames given"}
+    if len(hostnames) > DNS_MANY_MAX_NAMES:
+        return {"error": f"Too many hostnames ({len(hostnames)}); the limit is {DNS_MANY_MAX_NAMES} per call"}
+
+    logger.info(f"DNS lookup for {len(hostnames)} names ({record_type} records)")
+    semaphore = asyncio.Semaphore(DNS_MANY_CONCURRENCY)
+
+    async def lookup(hostname):
+        async with semaphore:
+            try:
+                answers = await _resolve(hostname, record_type)
+                return {
+                    "status": "ok",
+                    "records": [rdata.to_text() for rdata in answers],
+                    "ttl": max(0, int(answers.expiration - time.time())),
+                }
+            except dns.resolver.NXDOMAIN:
+                return {"status": "nxdomain"}
+            except dns.resolver.NoAnswer:
+                return {"status": "no_answer"}
+            except dns.resolver.Timeout:
+                return {"status": "timeout"}
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+    answers = await asyncio.gather(*(lookup(hostname) for hostname in hostnames))
+    results = dict(zip(hostnames, answers))
+    resolved = sum(1 for answer in answers if answer["status"] == "ok")
+    logger.info(f"DNS batch done: {resolved} of {len(hostnames)} names resolved")
+    return {"record_type": record_type.upper(), "resolved": resolved, "results": results}
+
+
+@mcp.tool()
+@cached_tool(ttl=CACHE_TTLS["check_port"])
 async def check_port(hostname: str, port: int, timeout: float = 3.0) -> str:
     """
     Check if a TCP port is open on a host.
@@ -171,12 +628,182 @@ async def check_port(hostname: str, port: int, timeout: float = 3.0) -> str:
         return error_msg
 
 
+def _parse_ports(ports: str) -> list:
+    """Turn "22,80,443,8000-8010" into a sorted list of port numbers."""
+    result = set()
+    for part in ports.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(value) for value in part.split("-", 1))
+        else:
+            first = last = int(part)
+        if not 1 <= first <= last <= 65535:
+            raise ValueError(f"invalid port range '{part}'")
+        result.update(range(first, last + 1))
+    return sorted(result)
+
+
+def _expand_hosts(hosts: list) -> list:
+    """Expand CIDR blocks like 10.0.0.0/28 into their host addresses; leave names alone."""
+    expanded = []
+    for host in hosts:
+        host = host.strip()
+        if "/" in host:
+            network = ipaddress.ip_network(host, strict=False)
+            if network.num_addresses > PORT_SWEEP_MAX_PROBES:
+                raise ValueError(f"{host} is too large to sweep")
+            expanded.extend(str(address) for address in network.hosts())
+        elif host:
+            expanded.append(host)
+    return list(dict.fromkeys(expanded))
+
+
+async def _probe_port(family: int, sockaddr: tuple, timeout: float) -> str:
+    """
+    Try one non-blocking TCP connect: "open", "closed" (refused) or "filtered" (no answer).
+
+    Returns "not_checked" if no socket could be opened (e.g. out of file descriptors).
+    """
+    loop = asyncio.get_running_loop()
+    async with _socket_slots:
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f"Could not open a socket for {sockaddr[0]}:{sockaddr[1]}: {e}")
+            return "not_checked"
+        try:
+            sock.setblocking(False)
+            await asyncio.wait_for(loop.sock_connect(sock, sockaddr), timeout=timeout)
+            return "open"
+        except ConnectionRefusedError:
+            return "closed"
+        except (asyncio.TimeoutError, OSError):
+            return "filtered"
+        finally:
+            sock.close()
+
+
+@mcp.tool()
+@cached_tool(ttl=CACHE_TTLS["port_sweep"])
+async def port_sweep(hosts: list[str], ports: str = "22,80,443", timeout: float = 1.0,
+                     max_seconds: float = 60.0, ctx: Context = None) -> dict:
+    """
+    Check many TCP ports on many hosts at once and list the open ones.
+
+    Use this instead of calling check_port repeatedly when checking several hosts or ports.
+    Open ports are streamed to the client as they are found, and the sweep can be cancelled.
+
+    Args:
+        hosts: Hostnames, IP addresses or CIDR blocks (e.g., ["10.0.0.1", "10.0.1.0/24"])
+        ports: Ports and ranges to check (e.g., "22,80,443" or "1-1024") (default: "22,80,443")
+        timeout: Seconds to wait for each connection (default: 1.0)
+        max_seconds: Overall time limit for the sweep; unchecked probes are counted (default: 60.0)
+
+    Returns:
+        Open ports per host with service names, counts of closed and filtered probes,
+        and any hosts that could not be resolved
+    """
+    try:
+        port_list = _parse_ports(ports)
+        host_list = _expand_hosts(hosts)
+    except ValueError as e:
+        return {"error": str(e)}
+    if not host_list or not port_list:
+        return {"error": "No hosts or ports given"}
+    total = len(host_list) * len(port_list)
+    if total > PORT_SWEEP_MAX_PROBES:
+        return {"error": f"Too many probes ({total}); the limit is {PORT_SWEEP_MAX_PROBES} per call"}
+
+    logger.info(f"Sweeping {len(port_list)} ports on {len(host_list)} hosts ({total} probes)")
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    deadline = started + max_seconds
+    concurrency = min(PORT_SWEEP_CONCURRENCY, _socket_limit())
+
+    # Resolve every host once, not once per port. IP addresses (including every address
+    # from a CIDR block) are used as they are; only real hostnames need a lookup
+    resolved = {}
+    hostnames = []
+    for host in host_list:
+        literal = _literal_address(host)
+        if literal:
+            resolved[host] = literal
+        else:
+            hostnames.append(host)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(host):
+        async with semaphore:
+            try:
+                family, _, _, _, sockaddr = (await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM))[0]
+                return host, (family, sockaddr)
+            except socket.gaierror:
+                return host, None
+
+    resolved.update(await asyncio.gather(*(resolve(host) for host in hostnames)))
+    unresolved = [host for host in host_list if resolved[host] is None]
+
+    # A fixed set of workers pulls probes from one shared generator, so memory stays
+    # the same whether the sweep is 10 probes or 100,000
+    probes = ((host, port) for host in host_list if resolved[host] for port in port_list)
+    open_ports = {}
+    counts = {"open": 0, "closed": 0, "filtered": 0, "not_checked": 0}
+
+    async def worker():
+        for host, port in probes:
+            if time.perf_counter() > deadline:
+                counts["not_checked"] += 1
+                continue
+            family, sockaddr = resolved[host]
+            state = await _probe_port(family, (sockaddr[0], port) + tuple(sockaddr[2:]), timeout)
+            counts[state] += 1
+            checked = counts["open"] + counts["closed"] + counts["filtered"]
+            if state == "open":
+                service = TCP_SERVICES.get(port, "unknown")
+                open_ports.setdefault(host, {})[port] = service
+                await _report(ctx, checked, total, f"{host}:{port} open ({service})")
+            elif checked % PORT_SWEEP_PROGRESS_EVERY == 0:
+                await _report(ctx, checked, total)
+
+    # If one worker fails (or the client cancels), stop the others too instead of
+    # leaving them probing in the background
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, total))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    # Report hosts and ports in the order they were given
+    open_ports = {
+        host: {str(port): open_ports[host][port] for port in sorted(open_ports[host])}
+        for host in host_list if host in open_ports
+    }
+    elapsed = time.perf_counter() - started
+    logger.info(f"Sweep done: {counts['open']} open, {counts['closed']} closed, "
+                f"{counts['filtered']} filtered in {elapsed:.1f}s")
+    return {
+        "open": open_ports,
+        "counts": counts,
+        "unresolved": unresolved,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+@mcp.resource("network-tools://cache-stats")
+def tool_cache_stats() -> dict:
+    """Hit, miss and coalesced-call counters for each tool's result cache."""
+    return cache_stats()
+
+
 if __name__ == "__main__":
     import os
 
     port = int(os.getenv("MCP_SERVER_PORT", "8000"))
     logger.info(f"Starting Network Tools MCP server")
-    logger.info(f"Available tools: ping, dns_lookup, check_port")
+    logger.info(f"Available tools: ping, ping_many, dns_lookup, dns_lookup_many, check_port, port_sweep")
 
     # FastMCP uses its own run method
     mcp.run()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Request coalescing and a short-lived result cache for MCP tools.
+Identical calls that arrive while one is already running share its result,
+and finished results are reused for a few seconds.
+
+Usage (the cache goes under @mcp.tool() so FastMCP registers the cached version):
+
+    @mcp.tool()
+    @cached_tool(ttl=10)
+    async def ping(hostname: str, count: int = 4) -> str:
+        ...
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from fastmcp import Context
+
+logger = logging.getLogger(__name__)
+
+# Every cached tool's cache, by tool name
+_tool_caches = {}
+
+
+class ToolCache:
+    """Results and in-flight calls for one tool, with hit/miss counters."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.results = OrderedDict()  # key -> (expires_at, result), oldest first
+        self.in_flight = {}           # key -> {"task": asyncio.Task, "waiters": int}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """Return (True, result) for a fresh cached result, or (False, None)."""
+        entry = self.results.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self.results[key]
+            return False, None
+        self.results.move_to_end(key)
+        return True, result
+
+    def finish(self, key: str, task: asyncio.Task) -> None:
+        """Done-callback for a call: stop sharing it and keep its result if it succeeded."""
+        self.in_flight.pop(key, None)
+        if self.ttl <= 0 or task.cancelled() or task.exception() is not None:
+            return
+        self.results[key] = (time.monotonic() + self.ttl, task.result())
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "ttl_seconds": self.ttl,
+            "entries": len(self.results),
+            "max_entries": self.max_entries,
+            "in_flight": len(self.in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+def cached_tool(ttl: float = 10.0, max_entries: int = 256):
+    """
+    Decorate an async tool so identical calls are coalesced and results cached.
+
+    Args:
+        ttl: Seconds to reuse a finished result; 0 only coalesces calls already in flight
+        max_entries: Most results to keep for this tool; the least recently used go first
+
+    Exceptions are never cached. A Context parameter is left out of the key, since it
+    differs per request; coalesced callers don't get the first caller's progress messages.
+    """
+
+    def decorator(func):
+        cache = _tool_caches[func.__name__] = ToolCache(func.__name__, ttl, max_entries)
+        signature = inspect.signature(func)
+        context_parameters = {
+            name for name, parameter in signature.parameters.items() if parameter.annotation is Context
+        }
+
+        def make_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name not in context_parameters}
+            return json.dumps(arguments, sort_keys=True, default=str)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            found, result = cache.get(key)
+            if found:
+                cache.hits += 1
+                logger.info(f"Cache hit for {cache.name}")
+                return result
+
+            flight = cache.in_flight.get(key)
+            if flight is not None:
+                cache.coalesced += 1
+                logger.info(f"Joining in-flight {cache.name} call")
+            else:
+                cache.misses += 1
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                flight = cache.in_flight[key] = {"task": task, "waiters": 0}
+                task.add_done_callback(functools.partial(cache.finish, key))
+
+            flight["waiters"] += 1
+            try:
+                # Shielded so one caller cancelling doesn't cancel the call for the others
+                return await asyncio.shield(flight["task"])
+            except asyncio.CancelledError:
+                # The last caller to give up cancels the shared call too
+                if flight["waiters"] == 1:
+                    flight["task"].cancel()
+                raise
+            finally:
+                flight["waiters"] -= 1
+
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and sizes for every cached tool."""
+    return {name: cache.stats() for name, cache in _tool_caches.items()}
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Per-tool metrics for FastMCP servers: call, error and cancellation counts,
+calls in flight, and latency histograms for every registered tool.
+
+Usage:
+
+    mcp = FastMCP("Network Tools")
+    metrics = instrument(mcp)
+
+The numbers are served as MCP resources (metrics://tools as JSON and
+metrics://tools/prometheus as Prometheus text). Set MCP_METRICS_DIR to also
+write the Prometheus text to <dir>/<server name>.prom, e.g. for node_exporter's
+textfile collector. Each server gets its own file, so both lab servers can share one folder.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import re
+import time
+from fastmcp.server.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper limits in seconds (the same style Prometheus uses)
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+# "Error: ..." or "✗ Error pinging ...": what the lab tools return when they catch an exception
+ERROR_TEXT = re.compile(r"^\s*(?:✗\s*)?Error\b")
+
+
+def _is_error_result(result) -> bool:
+    """
+    Did the tool itself fail?
+
+    The lab tools catch their own exceptions and return a message starting with
+    "Error" (or "✗ Error"), or a dict with an "error" key, so those count too.
+    A negative answer such as "✗ Port 22 is CLOSED" or NXDOMAIN is a successful call.
+    """
+    if getattr(result, "is_error", False):
+        return True
+    structured = getattr(result, "structured_content", None)
+    if isinstance(structured, dict) and structured.get("error"):
+        return True
+    for block in getattr(result, "content", None) or []:
+        text = getattr(block, "text", None)
+        if text and ERROR_TEXT.match(text):
+            return True
+    return False
+
+
+class ToolMetrics(Middleware):
+    """FastMCP middleware that times every tool call and keeps counts per tool."""
+
+    def __init__(self, server_name: str, prometheus_path: str = None, write_interval: float = 15.0):
+        self.server_name = server_name
+        self.prometheus_path = prometheus_path
+        self.write_interval = write_interval
+        self.last_write = 0.0
+        self.tools = {}  # tool name -> its counters
+
+    def _tool(self, name: str) -> dict:
+        if name not in self.tools:
+            self.tools[name] = {
+                "calls": 0,
+                "errors": 0,
+                "cancelled": 0,
+                "in_flight": 0,
+                "sum_seconds": 0.0,
+                "max_seconds": 0.0,
+                "bucket_counts": [0] * (len(BUCKETS) + 1),  # +1 for "+Inf"
+            }
+        return self.tools[name]
+
+    async def on_call_tool(self, context, call_next):
+        tool = self._tool(context.message.name)
+        tool["in_flight"] += 1
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(context)
+            outcome = "error" if _is_error_result(result) else "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            tool["in_flight"] -= 1
+            self._record(tool, time.perf_counter() - start, outcome)
+
+    def _record(self, tool: dict, seconds: float, outcome: str) -> None:
+        tool["calls"] += 1
+        if outcome == "error":
+            tool["errors"] += 1
+        elif outcome == "cancelled":
+            tool["cancelled"] += 1
+        tool["sum_seconds"] += seconds
+        tool["max_seconds"] = max(tool["max_seconds"], seconds)
+        index = 0
+        while index < len(BUCKETS) and seconds > BUCKETS[index]:
+            index += 1
+        tool["bucket_counts"][index] += 1
+
+        if self.prometheus_path and time.monotonic() - self.last_write >= self.write_interval:
+            self.write_prometheus()
+
+    def to_dict(self) -> dict:
+        """Summary per tool, with the mean latency worked out."""
+        summary = {}
+        for name, tool in sorted(self.tools.items()):
+            calls = tool["calls"]
+            summary[name] = {
+                "calls": calls,
+                "errors": tool["errors"],
+                "cancelled": tool["cancelled"],
+                "in_flight": tool["in_flight"],
+                "mean_seconds": round(tool["sum_seconds"] / calls, 6) if calls else 0,
+                "max_seconds": round(tool["max_seconds"], 6),
+                "buckets": dict(zip([str(limit) for limit in BUCKETS] + ["+Inf"], tool["bucket_counts"])),
+            }
+        return {"server": self.server_name, "tools": summary}
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        server = self.server_name.replace("\\", "\\\\").replace('"', '\\"')
+        counters = [
+            ("mcp_tool_calls_total", "counter", "Tool calls finished", "calls"),
+            ("mcp_tool_errors_total", "counter", "Tool calls that failed or reported an error", "errors"),
+            ("mcp_tool_cancelled_total", "counter", "Tool calls cancelled by the client", "cancelled"),
+            ("mcp_tool_in_flight", "gauge", "Tool calls currently running", "in_flight"),
+        ]
+        lines = []
+        for metric, metric_type, help_text, key in counters:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, tool in sorted(self.tools.items()):
+                lines.append(f'{metric}{{server="{server}",tool="{name}"}} {tool[key]}')
+
+        lines.append("# HELP mcp_tool_duration_seconds Time taken by each tool call")
+        lines.append("# TYPE mcp_tool_duration_seconds histogram")
+        for name, tool in sorted(self.tools.items()):
+            labels = f'server="{server}",tool="{name}"'
+            cumulative = 0
+            for limit, count in zip(BUCKETS + ["+Inf"], tool["bucket_counts"]):
+                cumulative += count
+                lines.append(f'mcp_tool_duration_seconds_bucket{{{labels},le="{limit}"}} {cumulative}')
+            lines.append(f"mcp_tool_duration_seconds_sum{{{labels}}} {tool['sum_seconds']:.6f}")
+            lines.append(f"mcp_tool_duration_seconds_count{{{labels}}} {tool['calls']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self) -> None:
+        """Write the Prometheus text to prometheus_path, swapping the file in whole."""
+        self.last_write = time.monotonic()
+        try:
+            temp_path = self.prometheus_path + ".tmp"
+            with open(temp_path, "w") as metrics_file:
+                metrics_file.write(self.to_prometheus())
+            os.replace(temp_path, self.prometheus_path)
+        except OSError as e:
+            logger.error(f"Could not write metrics to {self.prometheus_path}: {e}")
+
+
+def instrument(mcp, prometheus_path: str = None) -> ToolMetrics:
+    """
+    Add metrics to every tool on a FastMCP server and serve them as resources.
+
+    Args:
+        mcp: The FastMCP server
+        prometheus_path: File to keep the Prometheus text in
+            (default: $MCP_METRICS_DIR/<server name>.prom, if MCP_METRICS_DIR is set)
+
+    Returns:
+        The ToolMetrics middleware, for reading the numbers directly
+    """
+    if prometheus_path is None and os.getenv("MCP_METRICS_DIR"):
+        file_name = re.sub(r"[^a-z0-9]+", "_", mcp.name.lower()).strip("_") + ".prom"
+        prometheus_path = os.path.join(os.getenv("MCP_METRICS_DIR"), file_name)
+    metrics = ToolMetrics(mcp.name, prometheus_path)
+    mcp.add_middleware(metrics)
+
+    @mcp.resource("metrics://tools", mime_type="application/json")
+    def tool_metrics() -> dict:
+        """Calls, errors, calls in flight and latency histogram for each tool."""
+        return metrics.to_dict()
+
+    @mcp.resource("metrics://tools/prometheus", mime_type="text/plain")
+    def tool_metrics_prometheus() -> str:
+        """The same tool metrics in Prometheus text format."""
+        return metrics.to_prometheus()
+
+    if metrics.prometheus_path:
+        # Make sure the last calls before shutdown are written too
+        atexit.register(metrics.write_prometheus)
+    return metrics
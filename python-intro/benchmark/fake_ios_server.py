@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fake Cisco IOS SSH fleet for offline benchmarking.
+
+Every simulated device listens on its own loopback address (127.0.1.1, 127.0.1.2, ...)
+on the same TCP port. Linux routes all of 127.0.0.0/8 to the loopback interface,
+so no setup is needed there; on macOS each address has to be aliased first.
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import random
+import asyncssh
+
+FIRST_ADDRESS = ipaddress.IPv4Address("127.0.1.1")
+
+# Canned answers for the commands used throughout the lab
+CANNED_OUTPUT = {
+    "show clock": "*12:00:00.000 UTC Mon Jan 1 2024",
+    "show ver | i Last reload reason:": "Last reload reason: Reload Command",
+}
+
+# Commands Netmiko sends while preparing the session; they print nothing
+SILENT_COMMANDS = {"", "terminal length 0", "terminal width 511"}
+
+
+def device_addresses(count):
+    """Return the loopback address of every simulated device."""
+    return [str(FIRST_ADDRESS + index) for index in range(count)]
+
+
+class FakeIOSServer(asyncssh.SSHServer):
+    """Password-only SSH server that fails a configurable share of logins."""
+
+    def __init__(self, failure_rate):
+        self.failure_rate = failure_rate
+
+    def begin_auth(self, username):
+        return True
+
+    def password_auth_supported(self):
+        return True
+
+    def validate_password(self, username, password):
+        # Simulate an overloaded AAA server or a full set of VTY lines
+        return random.random() >= self.failure_rate
+
+
+def build_output(command, output_size):
+    """Return the device's answer to a command, padded to roughly output_size bytes."""
+    if command in SILENT_COMMANDS:
+        return ""
+    if not command.startswith("show"):
+        return "% Invalid input detected at '^' marker."
+    output = CANNED_OUTPUT.get(command, f"Output of {command}")
+    if output_size > len(output):
+        filler_line = "x" * 79
+        output += ("\n" + filler_line) * ((output_size - len(output)) // 80)
+    return output
+
+
+def make_session_handler(latency, output_size):
+    """Build the coroutine that plays the part of the IOS exec shell."""
+
+    async def handle_session(process):
+        address = process.get_extra_info("sockname")[0]
+        prompt = "R" + address.replace(".", "-") + "#"
+        process.stdout.write(prompt)
+        try:
+            while True:
+                line = await process.stdin.readline()
+                if not line:
+                    break
+                command = line.strip()
+                # IOS echoes each command as it reads it from the type-ahead buffer
+                process.stdout.write(command + "\r\n")
+                if command in ("exit", "quit", "logout"):
+                    break
+                if command not in SILENT_COMMANDS:
+                    await asyncio.sleep(latency)
+                output = build_output(command, output_size)
+                if output:
+                    process.stdout.write(output.replace("\n", "\r\n") + "\r\n")
+                process.stdout.write(prompt)
+        except (asyncssh.Error, ConnectionError):
+            pass
+        process.exit(0)
+
+    return handle_session
+
+
+async def start_fleet(devices, port, latency=0.0, output_size=0, failure_rate=0.0):
+    """Start one listener per simulated device and return the list of servers."""
+    host_key = asyncssh.generate_private_key("ssh-ed25519")
+    handler = make_session_handler(latency, output_size)
+    servers = []
+    for address in device_addresses(devices):
+        server = await asyncssh.create_server(
+            lambda: FakeIOSServer(failure_rate),
+            address,
+            port,
+            server_host_keys=[host_key],
+            process_factory=handler,
+            line_editor=False,
+        )
+        servers.append(server)
+    return servers
+
+
+async def serve(args):
+    await start_fleet(args.devices, args.port, args.latency, args.output_size, args.failure_rate)
+    # The benchmark harness waits for this line before it starts measuring
+    print(f"ready: {args.devices} devices on port {args.port}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a fleet of Cisco IOS devices over SSH")
+    parser.add_argument("--devices", type=int, default=50, help="Number of simulated devices")
+    parser.add_argument("--port", type=int, default=2222, help="TCP port every device listens on")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each show command takes")
+    parser.add_argument("--output-size", type=int, default=0, help="Pad each show output to about this many bytes")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of logins to reject (0.0-1.0)")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Benchmark the lab's collection strategies against a simulated IOS fleet.
+
+The harness starts fake_ios_server.py, writes an inventory CSV for it, and then runs
+each strategy in its own Python process so peak memory is measured per strategy.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCHMARK_DIR), "scripts")
+sys.path.insert(0, BENCHMARK_DIR)
+
+from fake_ios_server import device_addresses  # noqa: E402
+
+COMMANDS = ["show clock", "show ver | i Last reload reason:"]
+
+# Strategy name -> (lab script, how to run it over the whole inventory).
+# 08_functions.py stands in for the sequential Parts 4-7: they run the same loop, but at
+# import time against hard-coded hosts, so there is nothing the harness could call
+STRATEGIES = {
+    "sequential": (
+        "08_functions.py",
+        lambda module, devices, workers: [module.connect_and_run_commands(ip, COMMANDS) for ip in devices],
+    ),
+    "threads": (
+        "09_concurrent.py",
+        lambda module, devices, workers: module.run_concurrent_tasks(devices, COMMANDS, workers),
+    ),
+    "asyncio": (
+        "10_asyncio.py",
+        lambda module, devices, workers: asyncio.run(module.run_async_tasks(devices, COMMANDS, workers)),
+    ),
+    "batched": (
+        "16_batched_commands.py",
+        lambda module, devices, workers: module.run_concurrent_tasks(devices, COMMANDS, workers),
+    ),
+}
+
+
+def load_script(file_name):
+    """Import a numbered lab script as a module."""
+    path = os.path.join(SCRIPTS_DIR, file_name)
+    module_name = "lab_" + os.path.splitext(file_name)[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def redirect_to_fake_fleet(module, port):
+    """Point a lab script at the fake fleet's port instead of 22."""
+    if hasattr(module, "ConnectHandler"):
+        connect_handler = module.ConnectHandler
+        module.ConnectHandler = lambda **device: connect_handler(**dict(device, port=port))
+    if hasattr(module, "asyncssh"):
+        asyncssh_connect = module.asyncssh.connect
+        module.asyncssh = types.SimpleNamespace(
+            connect=lambda host, **options: asyncssh_connect(host, **dict(options, port=port))
+        )
+
+
+def time_each_device(module, durations):
+    """Wrap connect_and_run_commands so every call records how long it took."""
+    original = module.connect_and_run_commands
+
+    if asyncio.iscoroutinefunction(original):
+        async def timed(ip, commands, semaphore):
+            # Take the concurrency slot here so queueing time is not counted,
+            # which matches what the thread pool strategies measure
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return await original(ip, commands, asyncio.Semaphore(1))
+                finally:
+                    durations.append(time.perf_counter() - start)
+    else:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - start)
+
+    module.connect_and_run_commands = timed
+
+
+def run_worker(strategy, inventory_path, port, workers):
+    """Run one strategy in this process and print its measurements as JSON."""
+    # The lab scripts read credentials at import time; the fake fleet accepts any
+    os.environ.setdefault("USERNAME9", "bench")
+    os.environ.setdefault("PASSWORD9", "bench")
+
+    script, runner = STRATEGIES[strategy]
+    module = load_script(script)
+    redirect_to_fake_fleet(module, port)
+    durations = []
+    time_each_device(module, durations)
+
+    devices, _, _ = module.read_input_csv(inventory_path)
+    start = time.perf_counter()
+    # The lab scripts print a line per device; keep that out of the measurements
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = runner(module, devices, workers)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for row in rows if any(cell.startswith("Error: ") for cell in row[1:]))
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "strategy": strategy,
+        "devices": len(devices),
+        "errors": errors,
+        "seconds": elapsed,
+        "durations": durations,
+        "peak_rss_kb": peak_rss_kb,
+    }))
+
+
+def percentile(values, percent):
+    """Return the value below which the given percentage of values fall."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def write_inventory(path, devices):
+    """Write an input CSV in the lab's format for the simulated devices."""
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["IP"] + COMMANDS)
+        for address in device_addresses(devices):
+            writer.writerow([address] + [""] * len(COMMANDS))
+
+
+def start_fleet(args):
+    """Launch fake_ios_server.py and wait until every device is listening."""
+    server = subprocess.Popen(
+        [
+            sys.executable, os.path.join(BENCHMARK_DIR, "fake_ios_server.py"),
+            "--devices", str(args.devices),
+            "--port", str(args.port),
+            "--latency", str(args.latency),
+            "--output-size", str(args.output_size),
+            "--failure-rate", str(args.failure_rate),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    ready_line = server.stdout.readline()
+    if not ready_line.startswith("ready"):
+        server.kill()
+        raise RuntimeError("Fake IOS fleet failed to start")
+    return server
+
+
+def run_benchmarks(args):
+    """Run every selected strategy and print a summary table."""
+    server = start_fleet(args)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inventory_path = os.path.join(temp_dir, "inventory.csv")
+            write_inventory(inventory_path, args.devices)
+            for strategy in args.strategies:
+                completed = subprocess.run(
+                    [
+                        sys.executable, os.path.abspath(__file__),
+                        "--worker", strategy,
+                        "--inventory", inventory_path,
+                        "--port", str(args.port),
+                        "--workers", str(args.workers),
+                    ],
+                    capture_output=True,
+                    text=True,
+                )
+                if completed.returncode != 0:
+                    print(f"{strategy} failed:\n{completed.stderr}")
+                    continue
+                results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"\n{args.devices} devices, {args.latency}s per command, "
+          f"{args.output_size} byte outputs, {args.failure_rate:.0%} login failures\n")
+    print(f"{'strategy':<12}{'devices/s':>10}{'p50 (s)':>10}{'p99 (s)':>10}{'peak RSS (MB)':>15}{'errors':>8}")
+    for result in results:
+        print(
+            f"{result['strategy']:<12}"
+            f"{result['devices'] / result['seconds']:>10.1f}"
+            f"{percentile(result['durations'], 50):>10.3f}"
+            f"{percentile(result['durations'], 99):>10.3f}"
+            f"{result['peak_rss_kb'] / 1024:>15.1f}"
+            f"{result['errors']:>8}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark collection strategies against a fake IOS fleet")
+    parser.add_argument("--devices", type=int, default=50, help="Number of simulated devices")
+    parser.add_argument("--port", type=int, default=2222, help="TCP port for the fake fleet")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each show command takes")
+    parser.add_argument("--output-size", type=int, default=0, help="Pad each show output to about this many bytes")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of logins to reject (0.0-1.0)")
+    parser.add_argument("--workers", type=int, default=40, help="max_workers / max_concurrency for each strategy")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES),
+                        help="Strategies to run (default: all)")
+    parser.add_argument("--json", help="Also save the raw results to this JSON file")
+    # Internal: run a single strategy in this process and print JSON
+    parser.add_argument("--worker", choices=list(STRATEGIES), help=argparse.SUPPRESS)
+    parser.add_argument("--inventory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.inventory, args.port, args.workers)
+    else:
+        run_benchmarks(args)
@@ -0,0 +1,140 @@
+import csv
+import re
+from dotenv import load_dotenv
+import os
+#import the asyncio toolbox and asyncssh, a non-blocking SSH library
+import asyncio
+import asyncssh
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# A Cisco prompt looks like "Router1#" or "Router1>" at the end of the output
+PROMPT_PATTERN = re.compile(r"([\w\-\.\(\)/:]+[#>])\s*$")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to read from the SSH session until the device prints its prompt again
+async def read_until_prompt(process, prompt=None, command=None, timeout=30):
+    output = ""
+    while True:
+        # 'await' hands control back to the event loop while we wait for data,
+        # so hundreds of other devices can make progress in the meantime
+        chunk = await asyncio.wait_for(process.stdout.read(65535), timeout=timeout)
+        if not chunk:
+            raise ConnectionError("Session closed before the prompt was seen")
+        output += chunk
+        if prompt is None:
+            # We don't know the prompt yet, so look for anything ending in # or >
+            match = PROMPT_PATTERN.search(output)
+            if match:
+                return output, match.group(1)
+        elif output.rstrip().endswith(prompt):
+            # Make sure this is the prompt *after* our command, not a leftover one
+            if command is None or command in output:
+                return output, prompt
+
+# Function to remove the echoed command and the trailing prompt from the output
+def clean_output(raw_output, command, prompt):
+    lines = raw_output.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    # The device echoes the command back to us, so skip everything up to that line
+    for index, line in enumerate(lines):
+        if command in line:
+            lines = lines[index + 1:]
+            break
+    # The last line is the prompt waiting for the next command
+    if lines and lines[-1].strip() == prompt:
+        lines = lines[:-1]
+    return "\n".join(lines).strip()
+
+# Async version of connect_and_run_commands from Part 9
+async def connect_and_run_commands(ip, commands, semaphore):
+    # The semaphore is a bouncer: only a limited number of devices get in at once
+    async with semaphore:
+        try:
+            # known_hosts=None skips host key checking, just like Netmiko does by default
+            async with asyncssh.connect(
+                ip,
+                port=22,
+                username=username,
+                password=password,
+                known_hosts=None,
+                connect_timeout=20,
+            ) as conn:
+                # Open an interactive shell, the same way Netmiko does
+                async with conn.create_process(term_type="vt100", term_size=(511, 1000)) as process:
+                    print(f"Successfully connected to {ip}")
+
+                    # Wake up the session and learn the device prompt
+                    process.stdin.write("\n")
+                    _, prompt = await read_until_prompt(process)
+
+                    # Turn off the "--More--" pager so long outputs come back in one piece
+                    process.stdin.write("terminal length 0\n")
+                    await read_until_prompt(process, prompt, "terminal length 0")
+
+                    # Run each command and collect the results
+                    ip_results = [ip]  # Start with the IP in the first column
+                    for command in commands:
+                        process.stdin.write(command + "\n")
+                        raw_output, _ = await read_until_prompt(process, prompt, command)
+                        ip_results.append(clean_output(raw_output, command, prompt))
+
+                    process.stdin.write("exit\n")
+            return ip_results
+        except Exception as e:
+            print(f"Failed to connect to {ip}: {str(e)}")
+            # Return the error message in place of results for this IP
+            return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to run all devices on a single event loop
+async def run_async_tasks(devices, commands, max_concurrency=500):
+    # Never have more than max_concurrency SSH sessions open at the same time
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Create one task per device; they are cheap, so thousands are fine
+    tasks = [connect_and_run_commands(ip, commands, semaphore) for ip in devices]
+
+    # gather() waits for all of them and keeps the results in input order
+    results = await asyncio.gather(*tasks)
+    return list(results)
+
+# Main function to tie everything together
+def main(input_csv, output_csv, max_concurrency=500):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Run every device on one event loop
+    results = asyncio.run(run_async_tasks(devices, commands, max_concurrency))
+
+    # Step 3: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_async.csv'  # Output file for results
+    main(input_csv, output_csv, max_concurrency=500)  # One process, hundreds of devices in flight
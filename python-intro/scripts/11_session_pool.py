@@ -0,0 +1,204 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to build a session pool
+import threading
+import time
+from collections import OrderedDict
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# A session pool keeps SSH sessions open between runs so we can skip the
+# TCP connect, key exchange and login the next time we poll the same device
+class SessionPool:
+    def __init__(self, max_size=500, max_idle=300):
+        self.max_size = max_size    # Most idle sessions we keep open at once
+        self.max_idle = max_idle    # Seconds a session may sit unused before we close it
+        # OrderedDict remembers insertion order: oldest (least recently used) first
+        self.idle_sessions = OrderedDict()
+        # Threads share the pool, so only one of them may change it at a time
+        self.lock = threading.Lock()
+
+    # Sessions are keyed by host AND credentials, never by host alone
+    def make_key(self, device):
+        return (device['host'], device.get('port', 22), device['username'], device['password'])
+
+    # Hand out a live session for this device, opening a new one only if we must
+    def get(self, device):
+        key = self.make_key(device)
+        with self.lock:
+            expired = self.pop_expired()
+            entry = self.idle_sessions.pop(key, None)
+        # Disconnecting talks to the device, so do it after letting go of the lock
+        for old_ssh in expired:
+            self.close(old_ssh)
+        if entry is not None:
+            ssh, _ = entry
+            # Liveness check: the device may have timed out our VTY line
+            if ssh.is_alive():
+                return ssh, True
+            self.close(ssh)
+        return ConnectHandler(**device), False
+
+    # Give a healthy session back so the next run can reuse it
+    def release(self, device, ssh):
+        key = self.make_key(device)
+        evicted = []
+        with self.lock:
+            self.idle_sessions[key] = (ssh, time.monotonic())
+            self.idle_sessions.move_to_end(key)
+            # Too many idle sessions? Close the least recently used ones
+            while len(self.idle_sessions) > self.max_size:
+                _, (old_ssh, _) = self.idle_sessions.popitem(last=False)
+                evicted.append(old_ssh)
+        for old_ssh in evicted:
+            self.close(old_ssh)
+
+    # Throw away a session that failed part way through a command
+    def discard(self, ssh):
+        self.close(ssh)
+
+    # Take out every session that has been idle for longer than max_idle and return them
+    # for the caller to close (the caller must already hold the lock)
+    def pop_expired(self):
+        now = time.monotonic()
+        expired = [key for key, (_, last_used) in self.idle_sessions.items()
+                   if now - last_used > self.max_idle]
+        return [self.idle_sessions.pop(key)[0] for key in expired]
+
+    # Disconnect without letting a dead session raise an error
+    def close(self, ssh):
+        try:
+            ssh.disconnect()
+        except Exception:
+            pass
+
+    # Close everything, e.g. when the program shuts down
+    def close_all(self):
+        with self.lock:
+            sessions = [ssh for ssh, _ in self.idle_sessions.values()]
+            self.idle_sessions.clear()
+        for ssh in sessions:
+            self.close(ssh)
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands, borrowing the session from the pool
+def connect_and_run_commands(ip, commands, pool):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh, reused = pool.get(cisco_router)
+        if reused:
+            print(f"Reusing session to {ip}")
+        else:
+            print(f"Successfully connected to {ip}")
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+    try:
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Instead of disconnecting, hand the session back to the pool
+        pool.release(cisco_router, ssh)
+        return ip_results
+    except Exception as e:
+        print(f"Failed to run commands on {ip}: {str(e)}")
+        # A session that broke mid-command is not safe to reuse
+        pool.discard(ssh)
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to handle concurrent execution of device connections
+def run_concurrent_tasks(devices, commands, pool, max_workers=20):
+    # This list will store the results for all devices
+    results = []
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands, pool): ip
+            for ip in devices
+        }
+
+        # As each task completes, collect the result
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+                results.append(result_row)
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Main function: poll the same fleet several times from one long-lived process
+def main(input_csv, output_csv, max_workers=40, rounds=3, interval=60):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Create one pool that lives for the whole program.
+    # Keep idle sessions a little longer than the gap between rounds
+    pool = SessionPool(max_size=len(devices), max_idle=interval * 2)
+
+    try:
+        for round_number in range(1, rounds + 1):
+            start = time.perf_counter()
+
+            # Step 3: Run the tasks concurrently; only the first round pays for the handshakes
+            results = run_concurrent_tasks(devices, commands, pool, max_workers)
+
+            # Step 4: Write the results to an output CSV
+            write_output_csv(output_csv, header, results)
+            print(f"Round {round_number} finished in {time.perf_counter() - start:.1f}s")
+
+            if round_number < rounds:
+                time.sleep(interval)
+    finally:
+        # Step 5: Always log out of every device before we exit
+        pool.close_all()
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_pooled.csv'  # Output file for results
+    main(input_csv, output_csv, max_workers=40, rounds=3, interval=60)
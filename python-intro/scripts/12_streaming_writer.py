@@ -0,0 +1,187 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to hand rows from the workers to a writer thread
+import queue
+import threading
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Writer thread: takes rows off the queue and writes them as soon as they arrive.
+# If writing fails (a full disk, say), the error goes into `errors` for the main thread
+def write_output_csv_streaming(csvfile, header, row_queue, window, errors,
+                               preserve_order=False, flush_every=50, flush_seconds=5):
+    pending = {}        # Reorder buffer: rows that finished before their turn
+    next_index = 0      # The input position we are waiting to write next
+    unflushed = 0
+    unreleased = 0      # Rows taken off the queue whose window slot is not given back yet
+    last_flush = time.monotonic()
+
+    try:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        csvfile.flush()
+
+        while True:
+            try:
+                item = row_queue.get(timeout=flush_seconds)
+            except queue.Empty:
+                item = False  # Nothing arrived for a while; just flush below
+
+            if item is None:
+                return  # None means "all devices are done"
+
+            ready = []
+            if item:
+                unreleased += 1
+                index, row = item
+                if preserve_order:
+                    # Hold the row until every row before it has been written
+                    pending[index] = row
+                    while next_index in pending:
+                        ready.append(pending.pop(next_index))
+                        next_index += 1
+                else:
+                    ready.append(row)
+
+            for row in ready:
+                writer.writerow(row)
+                # Let the main thread start one more device
+                window.release()
+                unreleased -= 1
+                unflushed += 1
+
+            # Push rows to disk regularly so a crash only loses the last few
+            if unflushed and (unflushed >= flush_every or time.monotonic() - last_flush >= flush_seconds):
+                csvfile.flush()
+                unflushed = 0
+                last_flush = time.monotonic()
+    except Exception as e:
+        print(f"Error writing {csvfile.name}: {e}")
+        errors.append(e)
+
+    # We can't write any more, but the other threads must not get stuck waiting on us:
+    # give back every window slot and keep emptying the queue until the main thread is done
+    for _ in range(unreleased):
+        window.release()
+    while True:
+        item = row_queue.get()
+        if item is None:
+            break
+        window.release()
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to run devices concurrently and stream each row to the writer thread
+def run_concurrent_tasks(devices, commands, output_csv, header, max_workers=20,
+                         preserve_order=False, buffer_size=100):
+    # The queue between the workers and the writer; when it is full, workers wait
+    row_queue = queue.Queue(maxsize=buffer_size)
+
+    # The window caps how many devices are started but not yet written.
+    # It is what keeps memory (and the reorder buffer) small
+    window = threading.BoundedSemaphore(max_workers + buffer_size)
+
+    # Open the output file up front so a bad path fails before any device is touched
+    csvfile = open(output_csv, 'w', newline='')
+    writer_errors = []  # The writer thread puts its exception here if it fails
+    writer_thread = threading.Thread(
+        target=write_output_csv_streaming,
+        args=(csvfile, header, row_queue, window, writer_errors, preserve_order),
+    )
+    writer_thread.start()
+
+    # As each task completes, send its row straight to the writer
+    def send_to_writer(future, index, ip):
+        try:
+            result_row = future.result()
+        except Exception as e:
+            print(f"Error processing {ip}: {e}")
+            result_row = [ip] + [f"Error: {str(e)}"] * len(commands)
+        row_queue.put((index, result_row))
+
+    try:
+        # Use ThreadPoolExecutor to run tasks concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, ip in enumerate(devices):
+                # Wait here until the writer has caught up
+                window.acquire()
+                if writer_errors:
+                    break  # No point starting devices whose results can't be saved
+                future = executor.submit(connect_and_run_commands, ip, commands)
+                future.add_done_callback(
+                    lambda future, index=index, ip=ip: send_to_writer(future, index, ip)
+                )
+    finally:
+        # Tell the writer we are finished and wait for it to write the last rows
+        row_queue.put(None)
+        writer_thread.join()
+        csvfile.close()
+
+    # Fail the run instead of reporting success with a half-written file
+    if writer_errors:
+        raise writer_errors[0]
+
+# Main function to tie everything together
+def main(input_csv, output_csv, max_workers=40, preserve_order=False):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Run the tasks concurrently; rows land in the output CSV as they finish
+    run_concurrent_tasks(devices, commands, output_csv, header, max_workers, preserve_order)
+
+    print(f"Results saved to {output_csv}")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_streamed.csv'  # Output file for results
+    main(input_csv, output_csv, max_workers=40, preserve_order=True)  # Same row order as the input
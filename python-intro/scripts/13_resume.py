@@ -0,0 +1,167 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need for the run journal and command-line options
+import json
+import argparse
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to load the run journal into a dictionary.
+# Each line is one small JSON list: ["ok" or "error", ip, command].
+# The outputs themselves live in the output CSV, so the journal stays tiny
+def load_journal(journal_path):
+    journal_entries = {}
+    if not os.path.exists(journal_path):
+        return journal_entries
+    with open(journal_path, 'r', encoding='utf-8') as journal:
+        for line in journal:
+            try:
+                status, ip, command = json.loads(line)
+            except ValueError:
+                # A crash can leave a half-written last line; just skip it
+                continue
+            # Later lines win, so a retry that succeeded replaces an old failure
+            journal_entries[(ip, command)] = status
+    return journal_entries
+
+# Function to append one device's results to the journal
+def append_to_journal(journal, ip, commands, succeeded):
+    status = "ok" if succeeded else "error"
+    for command in commands:
+        journal.write(json.dumps([status, ip, command], separators=(',', ':')) + "\n")
+    # Flush straight away so the entry survives if the script is killed
+    journal.flush()
+
+# Function to copy the old output CSV, dropping the rows of devices we are about to run again.
+# It reads one row at a time, so even a huge file never has to fit in memory
+def drop_rows_to_redo(output_csv, redo):
+    temp_path = output_csv + '.tmp'
+    with open(output_csv, 'r', encoding='utf-8', newline='') as old_file, \
+         open(temp_path, 'w', encoding='utf-8', newline='') as new_file:
+        reader = csv.reader(old_file)
+        writer = csv.writer(new_file)
+        for row in reader:
+            if row and row[0] in redo:
+                continue
+            writer.writerow(row)
+    os.replace(temp_path, output_csv)
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, True
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands), False
+
+# Function to handle concurrent execution, writing each finished device to the output
+# CSV first and then to the journal, so a device is only "done" once its row is saved
+def run_concurrent_tasks(devices, commands, writer, csvfile, journal, max_workers=20):
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands): ip
+            for ip in devices
+        }
+
+        # As each task completes, save its row and record it in the journal
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row, succeeded = future.result()
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+                result_row, succeeded = [ip] + [f"Error: {str(e)}"] * len(commands), False
+            writer.writerow(result_row)
+            csvfile.flush()
+            append_to_journal(journal, ip, commands, succeeded)
+
+# Main function to tie everything together.
+# Rows are written in the order devices finish, not the input order
+def main(input_csv, output_csv, max_workers=40, resume=False):
+    # The journal lives next to the output file
+    journal_path = output_csv + '.journal'
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Without the old output there is nothing to resume from
+    if resume and not os.path.exists(output_csv):
+        print(f"No {output_csv} to resume from, starting a fresh run")
+        resume = False
+
+    # Step 2: On --resume, skip every device whose commands all succeeded last time
+    if resume:
+        journal_entries = load_journal(journal_path)
+        todo = [
+            ip for ip in devices
+            if any(journal_entries.get((ip, command)) != "ok" for command in commands)
+        ]
+        print(f"Resuming: {len(devices) - len(todo)} devices already done, {len(todo)} to go")
+        # Old rows for the devices we retry (errors, or a row saved just before a crash) go away
+        drop_rows_to_redo(output_csv, set(todo))
+        file_mode = 'a'
+    else:
+        todo = devices
+        file_mode = 'w'  # A fresh run starts a fresh output file and journal
+
+    # Step 3: Run the remaining devices, saving and journaling each one as it finishes
+    with open(output_csv, file_mode, encoding='utf-8', newline='') as csvfile, \
+         open(journal_path, file_mode, encoding='utf-8') as journal:
+        writer = csv.writer(csvfile)
+        if file_mode == 'w':
+            # Write the header (IP + commands)
+            writer.writerow(header)
+        run_concurrent_tasks(todo, commands, writer, csvfile, journal, max_workers)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent collection with a resumable run journal")
+    parser.add_argument('--input', default='../examples/input_150_devices.csv', help="Input file containing IPs and commands")
+    parser.add_argument('--output', default='../outputs/results_150.csv', help="Output file for results")
+    parser.add_argument('--workers', type=int, default=40, help="Number of devices to work on at once")
+    parser.add_argument('--resume', action='store_true', help="Skip devices that already succeeded in the last run")
+    args = parser.parse_args()
+
+    main(args.input, args.output, max_workers=args.workers, resume=args.resume)
@@ -0,0 +1,186 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to measure and adapt
+import time
+import statistics
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# AIMD = Additive Increase, Multiplicative Decrease (the same idea TCP uses).
+# While connections are fast and succeed, add a few more workers.
+# When logins slow down or start failing, cut the number of workers in half.
+class AIMDController:
+    def __init__(self, start=10, minimum=2, maximum=200, increase=2, decrease=0.5,
+                 max_failure_rate=0.2, latency_factor=2.0, window=10):
+        self.limit = start                        # How many devices we allow in flight right now
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase                  # Workers added after a healthy window
+        self.decrease = decrease                  # Multiplier applied after an unhealthy window
+        self.max_failure_rate = max_failure_rate  # More failures than this means back off
+        self.latency_factor = latency_factor      # Slower than baseline x this means back off
+        self.window = window                      # Results to look at before each decision
+        self.baseline_latency = None              # Fastest typical connect time we have seen
+        self.samples = []
+        self.ignore = 0                           # Results to skip after a back-off (see adjust)
+        self.start_time = time.monotonic()
+        self.history = [(0.0, start)]             # (seconds since start, limit)
+
+    # Called once for every finished device
+    def record(self, connect_seconds, succeeded):
+        if self.ignore:
+            self.ignore -= 1
+            return
+        self.samples.append((connect_seconds, succeeded))
+        if len(self.samples) >= self.window:
+            self.adjust()
+            self.samples = []
+
+    # Look at the last window of results and pick a new limit
+    def adjust(self):
+        failures = sum(1 for _, succeeded in self.samples if not succeeded)
+        failure_rate = failures / len(self.samples)
+        latencies = [seconds for seconds, succeeded in self.samples if succeeded]
+        median_latency = statistics.median(latencies) if latencies else None
+
+        # Remember the best median we have seen as "healthy"
+        if median_latency is not None and (self.baseline_latency is None or median_latency < self.baseline_latency):
+            self.baseline_latency = median_latency
+
+        if failure_rate > self.max_failure_rate:
+            reason = f"failure rate {failure_rate:.0%}"
+            new_limit = max(self.minimum, int(self.limit * self.decrease))
+        elif median_latency is not None and median_latency > self.baseline_latency * self.latency_factor:
+            reason = f"connect time {median_latency:.2f}s vs baseline {self.baseline_latency:.2f}s"
+            new_limit = max(self.minimum, int(self.limit * self.decrease))
+        else:
+            reason = "healthy"
+            new_limit = min(self.maximum, self.limit + self.increase)
+
+        if new_limit < self.limit:
+            # Devices already in flight were started at the old, too-high level.
+            # Skip their results so we don't keep cutting for the same problem
+            self.ignore = self.limit
+
+        if new_limit != self.limit:
+            elapsed = time.monotonic() - self.start_time
+            print(f"[{elapsed:6.1f}s] concurrency {self.limit} -> {new_limit} ({reason})")
+            self.limit = new_limit
+            self.history.append((elapsed, new_limit))
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands.
+# Besides the row, it reports how long the login took and whether it worked
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    start = time.perf_counter()
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        connect_seconds = time.perf_counter() - start
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, connect_seconds, True
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands), time.perf_counter() - start, False
+
+# Function to run devices concurrently, letting the controller decide how many at a time
+def run_concurrent_tasks(devices, commands, controller):
+    # This list will store the results for all devices
+    results = []
+    remaining = iter(devices)
+    future_to_ip = {}
+
+    # The pool is sized for the maximum; the controller decides how much of it we use
+    with concurrent.futures.ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        while True:
+            # Top up the number of devices in flight to the current limit
+            while len(future_to_ip) < controller.limit:
+                ip = next(remaining, None)
+                if ip is None:
+                    break
+                future_to_ip[executor.submit(connect_and_run_commands, ip, commands)] = ip
+
+            if not future_to_ip:
+                break  # Nothing running and nothing left to start
+
+            # Wait until at least one device finishes
+            done, _ = concurrent.futures.wait(future_to_ip, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ip = future_to_ip.pop(future)
+                try:
+                    result_row, connect_seconds, succeeded = future.result()
+                    controller.record(connect_seconds, succeeded)
+                    results.append(result_row)
+                except Exception as e:
+                    print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Main function to tie everything together
+def main(input_csv, output_csv, start_workers=10, max_workers=200):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Start small and let the controller find the right concurrency
+    controller = AIMDController(start=start_workers, maximum=max_workers)
+    results = run_concurrent_tasks(devices, commands, controller)
+
+    # Step 3: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+    # Step 4: Show how the concurrency level changed during the run
+    print("Concurrency over time:")
+    for elapsed, limit in controller.history:
+        print(f"  {elapsed:6.1f}s  {limit} workers")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_adaptive.csv'  # Output file for results
+    main(input_csv, output_csv, start_workers=10, max_workers=200)
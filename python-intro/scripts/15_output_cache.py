@@ -0,0 +1,195 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import sqlite3 (built into Python) to keep the cache in a file on disk
+import sqlite3
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# How long (in seconds) each command's output stays fresh.
+# A clock changes every second; a reload reason only changes when the device reloads
+COMMAND_TTLS = {
+    "show clock": 60,
+    "show ver | i Last reload reason:": 3600,
+}
+DEFAULT_TTL = 300  # For any command not listed above
+
+# An on-disk cache of command outputs, keyed by (host, command)
+class OutputCache:
+    def __init__(self, db_path, max_entries=100000):
+        self.max_entries = max_entries  # Oldest-used entries are removed beyond this
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS outputs (
+                host TEXT NOT NULL,
+                command TEXT NOT NULL,
+                output TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (host, command)
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS outputs_last_used ON outputs (last_used)")
+        self.db.commit()
+
+    # Return {command: output} for every command whose cached output is still fresh
+    def get_fresh(self, host, commands):
+        now = time.time()
+        fresh = {}
+        for command in commands:
+            row = self.db.execute(
+                "SELECT output, stored_at FROM outputs WHERE host = ? AND command = ?",
+                (host, command),
+            ).fetchone()
+            if row and now - row[1] <= COMMAND_TTLS.get(command, DEFAULT_TTL):
+                fresh[command] = row[0]
+        if fresh:
+            self.db.executemany(
+                "UPDATE outputs SET last_used = ? WHERE host = ? AND command = ?",
+                [(now, host, command) for command in fresh],
+            )
+        return fresh
+
+    # Save new outputs for one host
+    def store(self, host, outputs):
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO outputs (host, command, output, stored_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            [(host, command, output, now, now) for command, output in outputs.items()],
+        )
+
+    # Write changes to disk and trim the cache back down to max_entries
+    def commit(self):
+        count = self.db.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM outputs WHERE rowid IN (SELECT rowid FROM outputs ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        self.db.commit()
+
+    def close(self):
+        self.commit()
+        self.db.close()
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, True
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands), False
+
+# Function to run only the commands the cache can't answer.
+# The cache is only touched here in the main thread, so no locking is needed
+def run_concurrent_tasks(devices, commands, cache, max_workers=20):
+    results = {}
+    future_to_ip = {}
+    skipped = 0
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for ip in devices:
+            fresh = cache.get_fresh(ip, commands)
+            stale = [command for command in commands if command not in fresh]
+            results[ip] = fresh
+            if not stale:
+                # Every answer is fresh: no SSH connection at all
+                skipped += 1
+                continue
+            future = executor.submit(connect_and_run_commands, ip, stale)
+            future_to_ip[future] = (ip, stale)
+
+        # As each task completes, merge its outputs with the cached ones
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip, stale = future_to_ip[future]
+            try:
+                result_row, succeeded = future.result()
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+                result_row, succeeded = [ip] + [f"Error: {str(e)}"] * len(stale), False
+            outputs = dict(zip(stale, result_row[1:]))
+            # Only remember real answers; errors should be retried next time
+            if succeeded:
+                cache.store(ip, outputs)
+            results[ip].update(outputs)
+
+    cache.commit()
+    print(f"{skipped} of {len(devices)} devices answered entirely from cache")
+
+    # Put the columns back in header order
+    return [[ip] + [results[ip][command] for command in commands] for ip in devices]
+
+# Main function to tie everything together
+def main(input_csv, output_csv, cache_path, max_workers=40):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Open the cache (it is created the first time)
+    cache = OutputCache(cache_path)
+
+    try:
+        # Step 3: Run the tasks concurrently, skipping anything still fresh
+        results = run_concurrent_tasks(devices, commands, cache, max_workers)
+    finally:
+        cache.close()
+
+    # Step 4: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_cached.csv'  # Output file for results
+    cache_path = '../outputs/output_cache.db'  # Cache shared between runs
+    main(input_csv, output_csv, cache_path, max_workers=40)
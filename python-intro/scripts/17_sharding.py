@@ -0,0 +1,140 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import json to store parsed (structured) output in a CSV cell
+import json
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands.
+# With parse=True, Netmiko runs the output through TextFSM (ntc-templates),
+# which is CPU work and is the reason we spread devices across processes
+def connect_and_run_commands(ip, commands, parse=False):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command, use_textfsm=parse)
+            if isinstance(result, str):
+                ip_results.append(result.strip())  # Strip extra spaces/newlines
+            else:
+                # A template matched: store the list of records as JSON text
+                ip_results.append(json.dumps(result))
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to handle concurrent execution of device connections (same as Part 9)
+def run_concurrent_tasks(devices, commands, max_workers=20, parse=False):
+    # This list will store the results for all devices
+    results = []
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands, parse): ip
+            for ip in devices
+        }
+
+        # As each task completes, collect the result
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+                results.append(result_row)
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Function to split the devices across processes; each process runs its own thread pool.
+# Threads are great for waiting on the network, but only one thread can run Python
+# code at a time (the GIL). Separate processes each get their own GIL and CPU core
+def run_sharded_tasks(devices, commands, processes=None, threads_per_process=20, parse=False):
+    processes = processes or os.cpu_count() or 1
+
+    # Deal the devices out like cards so every shard gets a similar mix
+    shards = [devices[i::processes] for i in range(processes)]
+    shards = [shard for shard in shards if shard]
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [
+            executor.submit(run_concurrent_tasks, shard, commands, threads_per_process, parse)
+            for shard in shards
+        ]
+        # The parent process merges the rows coming back from every shard
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                print(f"Error processing shard: {e}")
+
+    # Put the merged rows back into the same order as the input file
+    position = {ip: index for index, ip in enumerate(devices)}
+    results.sort(key=lambda row: position[row[0]])
+    return results
+
+# Main function to tie everything together
+def main(input_csv, output_csv, processes=None, threads_per_process=20, parse=True):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Run the shards in parallel processes
+    results = run_sharded_tasks(devices, commands, processes, threads_per_process, parse)
+
+    # Step 3: Write the merged results to one output CSV
+    write_output_csv(output_csv, header, results)
+
+# Run the main function if this script is executed directly.
+# This guard is required: each new process imports this file, and must not start main() again
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_sharded.csv'  # Output file for results
+    main(input_csv, output_csv, processes=None, threads_per_process=20, parse=True)  # One process per CPU core
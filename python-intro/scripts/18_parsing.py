@@ -0,0 +1,182 @@
+import csv
+import os
+import json
+#import the process pool so parsing can use every CPU core
+import concurrent.futures
+#TextFSM and ntc-templates turn CLI text into structured records (both come with Netmiko)
+import textfsm
+from textfsm import clitable
+import ntc_templates
+
+# pyarrow is optional; it is only needed for Parquet output
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+device_type = "cisco_ios"
+
+# Folder that holds the ntc-templates .textfsm files and their index
+TEMPLATE_DIR = os.path.join(os.path.dirname(ntc_templates.__file__), "templates")
+
+# Each worker process fills these in once and then reuses them for every row
+TEMPLATE_INDEX = None
+TEMPLATE_CACHE = {}  # (platform, command) -> list of compiled TextFSM objects
+
+# Function to find and compile the templates for one (platform, command), once per process
+def get_templates(platform, command):
+    global TEMPLATE_INDEX
+    key = (platform, command)
+    if key in TEMPLATE_CACHE:
+        return TEMPLATE_CACHE[key]
+
+    # Loading the index is slow, so we only do it the first time
+    if TEMPLATE_INDEX is None:
+        TEMPLATE_INDEX = clitable.CliTable("index", TEMPLATE_DIR)
+
+    templates = []
+    row = TEMPLATE_INDEX.index.GetRowMatch({"Platform": platform, "Command": command})
+    if row:
+        # Some commands need more than one template, separated by ':'
+        for template_name in TEMPLATE_INDEX.index.index[row]["Template"].split(":"):
+            with open(os.path.join(TEMPLATE_DIR, template_name)) as template_file:
+                templates.append(textfsm.TextFSM(template_file))
+    TEMPLATE_CACHE[key] = templates
+    return templates
+
+# Function to parse one command output into a list of dictionaries
+def parse_output(platform, command, output):
+    records = []
+    for template in get_templates(platform, command):
+        # A compiled template remembers its last result, so clear it first
+        template.Reset()
+        for record in template.ParseTextToDicts(output):
+            records.append({field.lower(): value for field, value in record.items()})
+    return records
+
+# Function that runs inside a worker process: parse a chunk of CSV rows
+def parse_rows(rows, commands, platform):
+    parsed = []
+    for row in rows:
+        ip = row[0]
+        for command, output in zip(commands, row[1:]):
+            # Skip devices that never answered
+            if output.startswith("Error: "):
+                continue
+            for record in parse_output(platform, command, output):
+                parsed.append({"ip": ip, "command": command, "record": record})
+    return parsed
+
+# Function to read a results CSV (the output of Parts 8-17) in chunks
+def read_results_csv(file_path, chunk_size=500):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        header = next(reader)
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+
+# Function to add one chunk of parsed records to an open JSON Lines file: one JSON object per line
+def append_jsonl(output_file, records):
+    for record in records:
+        output_file.write(json.dumps(record) + "\n")
+
+# Writes parsed records as Parquet a chunk at a time, one file per command
+# (every command has different fields, so each gets its own table)
+class ParquetOutput:
+    def __init__(self, file_path):
+        if pyarrow is None:
+            raise RuntimeError("pyarrow not installed. Run: pip install pyarrow")
+        self.base, _ = os.path.splitext(file_path)
+        self.writers = {}  # command -> open ParquetWriter
+
+    # A chunk where a field is always empty gives it no type; make those strings so later chunks fit
+    def fill_in_types(self, schema):
+        fields = []
+        for field in schema:
+            if pyarrow.types.is_null(field.type):
+                field = field.with_type(pyarrow.string())
+            elif pyarrow.types.is_list(field.type) and pyarrow.types.is_null(field.type.value_type):
+                field = field.with_type(pyarrow.list_(pyarrow.string()))
+            fields.append(field)
+        return pyarrow.schema(fields)
+
+    def append(self, records):
+        by_command = {}
+        for record in records:
+            by_command.setdefault(record["command"], []).append(record)
+        for command, command_records in by_command.items():
+            writer = self.writers.get(command)
+            if writer is None:
+                # Turn "show ver | i Last reload reason:" into a safe file name
+                slug = "".join(c if c.isalnum() else "_" for c in command).strip("_")
+                schema = self.fill_in_types(pyarrow.Table.from_pylist(command_records).schema)
+                writer = self.writers[command] = pyarrow.parquet.ParquetWriter(f"{self.base}_{slug}.parquet", schema)
+            writer.write_table(pyarrow.Table.from_pylist(command_records, schema=writer.schema))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+# Main function: read collected results, parse them in parallel, write structured output.
+# Only a few chunks are in flight at once and each one is written as soon as it is parsed,
+# so memory stays flat however big the results file is
+def main(results_csv, output_path, platform=device_type, processes=None):
+    processes = processes or os.cpu_count() or 1
+    chunks = read_results_csv(results_csv)
+    saved = 0
+
+    # Step 1: Open the output: JSON Lines or Parquet depending on the file extension
+    if output_path.endswith(".parquet"):
+        parquet_output = ParquetOutput(output_path)
+        jsonl_file = None
+    else:
+        parquet_output = None
+        jsonl_file = open(output_path, 'w', encoding='utf-8')
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = set()
+            while True:
+                # Step 2: Keep every process busy with one chunk plus one waiting; the rest stay unread
+                while len(futures) < processes * 2:
+                    next_chunk = next(chunks, None)
+                    if next_chunk is None:
+                        break
+                    header, chunk = next_chunk
+                    futures.add(executor.submit(parse_rows, chunk, header[1:], platform))
+
+                if not futures:
+                    break
+
+                # Step 3: Save each chunk's records as soon as it finishes
+                done, futures = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        records = future.result()
+                    except Exception as e:
+                        print(f"Error parsing chunk: {e}")
+                        continue
+                    if parquet_output:
+                        parquet_output.append(records)
+                    else:
+                        append_jsonl(jsonl_file, records)
+                    saved += len(records)
+    finally:
+        if parquet_output:
+            parquet_output.close()
+        else:
+            jsonl_file.close()
+    print(f"Saved {saved} parsed records to {output_path}")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    results_csv = '../outputs/results_150.csv'  # Output of Part 9
+    output_path = '../outputs/parsed_150.jsonl'  # Use a .parquet name for Parquet output
+    main(results_csv, output_path)
@@ -0,0 +1,250 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to time each step and save the measurements
+import socket
+import threading
+import time
+import json
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# The steps of every device session, in order
+PHASES = ["tcp_connect", "ssh_auth", "prompt_detection", "command", "disconnect"]
+
+# Histogram bucket upper limits in seconds (the same style Prometheus uses)
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+# Steps that failed (a 20 second connect timeout, say) get their own histograms,
+# so they don't drag up the numbers for the steps that worked
+OUTCOMES = ["ok", "failed"]
+
+# Collects phase timings from every thread and groups them into histograms.
+# A histogram keeps counts per bucket instead of every single value,
+# so its size stays the same for 10 devices or 10,000. There is one histogram per (phase, outcome)
+class PhaseMetrics:
+    def __init__(self, trace_path=None):
+        self.lock = threading.Lock()
+        keys = [(phase, outcome) for phase in PHASES for outcome in OUTCOMES]
+        self.bucket_counts = {key: [0] * (len(BUCKETS) + 1) for key in keys}  # +1 for "+Inf"
+        self.sums = {key: 0.0 for key in keys}
+        self.counts = {key: 0 for key in keys}
+        self.maximums = {key: 0.0 for key in keys}
+        # Optional JSON Lines file with every device's individual timings
+        self.trace_file = open(trace_path, 'w', encoding='utf-8') if trace_path else None
+
+    # Add one device's timings, a list of (phase, seconds, outcome), to the histograms (and the trace file)
+    def record(self, ip, timings, commands, error=None):
+        with self.lock:
+            for phase, seconds, outcome in timings:
+                key = (phase, outcome)
+                index = 0
+                while index < len(BUCKETS) and seconds > BUCKETS[index]:
+                    index += 1
+                self.bucket_counts[key][index] += 1
+                self.sums[key] += seconds
+                self.counts[key] += 1
+                self.maximums[key] = max(self.maximums[key], seconds)
+
+            if self.trace_file:
+                trace = {"ip": ip, "phases": {}, "commands": {}, "error": error, "failed_phase": None}
+                command_times = iter(seconds for phase, seconds, _ in timings if phase == "command")
+                for phase, seconds, outcome in timings:
+                    if outcome == "failed":
+                        trace["failed_phase"] = phase
+                    if phase != "command":
+                        trace["phases"][phase] = round(seconds, 6)
+                for command, seconds in zip(commands, command_times):
+                    trace["commands"][command] = round(seconds, 6)
+                self.trace_file.write(json.dumps(trace) + "\n")
+
+    # Prometheus text format, ready for node_exporter's textfile collector or a pushgateway
+    def to_prometheus(self):
+        lines = [
+            "# HELP netmiko_phase_duration_seconds Time spent in each phase of a device session",
+            "# TYPE netmiko_phase_duration_seconds histogram",
+        ]
+        for phase in PHASES:
+            for outcome in OUTCOMES:
+                key = (phase, outcome)
+                labels = f'phase="{phase}",outcome="{outcome}"'
+                cumulative = 0
+                for limit, count in zip(BUCKETS + ["+Inf"], self.bucket_counts[key]):
+                    cumulative += count
+                    lines.append(f'netmiko_phase_duration_seconds_bucket{{{labels},le="{limit}"}} {cumulative}')
+                lines.append(f'netmiko_phase_duration_seconds_sum{{{labels}}} {self.sums[key]:.6f}')
+                lines.append(f'netmiko_phase_duration_seconds_count{{{labels}}} {self.counts[key]}')
+        return "\n".join(lines) + "\n"
+
+    # The same numbers as a JSON document: {phase: {"ok": {...}, "failed": {...}}}
+    def to_json(self):
+        summary = {}
+        for phase in PHASES:
+            summary[phase] = {}
+            for outcome in OUTCOMES:
+                key = (phase, outcome)
+                count = self.counts[key]
+                summary[phase][outcome] = {
+                    "count": count,
+                    "sum_seconds": round(self.sums[key], 6),
+                    "mean_seconds": round(self.sums[key] / count, 6) if count else 0,
+                    "max_seconds": round(self.maximums[key], 6),
+                    "buckets": dict(zip([str(limit) for limit in BUCKETS] + ["+Inf"], self.bucket_counts[key])),
+                }
+        return json.dumps(summary, indent=2)
+
+    def close(self):
+        if self.trace_file:
+            self.trace_file.close()
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands, timing every step.
+# ConnectHandler normally does TCP connect, SSH login and prompt detection in one go;
+# here we do each step ourselves so we can put a stopwatch on it
+def connect_and_run_commands(ip, commands, metrics):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    timings = []  # (phase, seconds, "ok" or "failed") in the order they happened
+    sock, ssh = None, None
+
+    # Small helper: run one step and remember how long it took and whether it worked
+    def timed(phase, step, *args):
+        start = time.perf_counter()
+        try:
+            result = step(*args)
+        except Exception:
+            timings.append((phase, time.perf_counter() - start, "failed"))
+            raise
+        timings.append((phase, time.perf_counter() - start, "ok"))
+        return result
+
+    # Attempt to connect and run commands
+    try:
+        # Phase 1: open the TCP connection ourselves and hand the socket to Netmiko
+        sock = timed("tcp_connect", socket.create_connection, (ip, cisco_router['port']), 20)
+        ssh = ConnectHandler(**cisco_router, sock=sock, auto_connect=False)
+
+        # Phase 2: SSH key exchange and login (what ConnectHandler's _open() does first)
+        ssh._modify_connection_params()
+        timed("ssh_auth", ssh.establish_connection)
+
+        # Phase 3: find the prompt, turn off paging (what _open() does next)
+        timed("prompt_detection", ssh._try_session_preparation)
+        print(f"Successfully connected to {ip}")
+
+        # Phase 4: run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = timed("command", ssh.send_command, command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Phase 5: disconnect after running commands
+        timed("disconnect", ssh.disconnect)
+        metrics.record(ip, timings, commands)
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        metrics.record(ip, timings, commands, error=str(e))
+        # Don't leave the session (or the bare socket, if login never finished) open
+        if ssh is not None:
+            try:
+                ssh.disconnect()
+            except Exception:
+                pass
+        if sock is not None:
+            sock.close()
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to handle concurrent execution of device connections
+def run_concurrent_tasks(devices, commands, metrics, max_workers=20):
+    # This list will store the results for all devices
+    results = []
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands, metrics): ip
+            for ip in devices
+        }
+
+        # As each task completes, collect the result
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+                results.append(result_row)
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Main function to tie everything together
+def main(input_csv, output_csv, metrics_path, max_workers=40, trace_path=None):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Run the tasks concurrently, timing every phase
+    metrics = PhaseMetrics(trace_path)
+    try:
+        results = run_concurrent_tasks(devices, commands, metrics, max_workers)
+    finally:
+        metrics.close()
+
+    # Step 3: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+    # Step 4: Save the timing summary (.json for JSON, anything else for Prometheus text)
+    with open(metrics_path, 'w') as metrics_file:
+        if metrics_path.endswith('.json'):
+            metrics_file.write(metrics.to_json())
+        else:
+            metrics_file.write(metrics.to_prometheus())
+
+    # Step 5: Print where the time went
+    print("Average time per phase:")
+    for phase in PHASES:
+        if metrics.counts[phase]:
+            print(f"  {phase:<17} {metrics.sums[phase] / metrics.counts[phase]:.3f}s")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150.csv'  # Output file for results
+    metrics_path = '../outputs/phase_timings.prom'  # Use a .json name for a JSON summary
+    trace_path = '../outputs/phase_trace.jsonl'  # Per-device timings (set to None to skip)
+    main(input_csv, output_csv, metrics_path, max_workers=40, trace_path=trace_path)
@@ -0,0 +1,176 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need for the reachability sweep and the circuit breaker
+import asyncio
+import ipaddress
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to check a single device: can we open TCP port 22 at all?
+async def check_ssh_port(ip, semaphore, port=22, timeout=2):
+    async with semaphore:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=timeout)
+            writer.close()
+            await writer.wait_closed()
+            return ip, True
+        except (OSError, asyncio.TimeoutError):
+            return ip, False
+
+# Function to sweep every device at once; dead hosts only cost the short timeout
+async def preflight_sweep(devices, max_concurrency=1000, timeout=2):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    checks = [check_ssh_port(ip, semaphore, timeout=timeout) for ip in devices]
+    results = await asyncio.gather(*checks)
+    return {ip for ip, reachable in results if reachable}
+
+# A circuit breaker per subnet: after too many failures in a row, stop sending
+# devices to that subnet. It "opens" like an electrical breaker
+class SubnetCircuitBreaker:
+    def __init__(self, failure_threshold=5, prefix_length=24):
+        self.failure_threshold = failure_threshold
+        self.prefix_length = prefix_length
+        self.consecutive_failures = {}
+        self.open_subnets = set()
+
+    # Hostnames have no subnet we can work out without DNS, so each one gets its own breaker
+    def subnet_of(self, ip):
+        try:
+            return ipaddress.ip_network(f"{ip}/{self.prefix_length}", strict=False)
+        except ValueError:
+            return ip
+
+    def allow(self, ip):
+        return self.subnet_of(ip) not in self.open_subnets
+
+    def record(self, ip, succeeded):
+        subnet = self.subnet_of(ip)
+        if succeeded:
+            self.consecutive_failures[subnet] = 0
+            return
+        self.consecutive_failures[subnet] = self.consecutive_failures.get(subnet, 0) + 1
+        if self.consecutive_failures[subnet] >= self.failure_threshold and subnet not in self.open_subnets:
+            print(f"Circuit open for {subnet}: {self.failure_threshold} failures in a row")
+            self.open_subnets.add(subnet)
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, True
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands), False
+
+# Function to run the SSH stage, checking the circuit breaker before each device.
+# Devices are handed to the pool a few at a time, so an open breaker can still stop them
+def run_concurrent_tasks(devices, commands, breaker, max_workers=20):
+    # This list will store the results for all devices
+    results = []
+    remaining = iter(devices)
+    future_to_ip = {}
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Keep every worker busy, skipping devices whose subnet is tripped
+            while len(future_to_ip) < max_workers:
+                ip = next(remaining, None)
+                if ip is None:
+                    break
+                if not breaker.allow(ip):
+                    results.append([ip] + ["Error: skipped, subnet circuit open"] * len(commands))
+                    continue
+                future_to_ip[executor.submit(connect_and_run_commands, ip, commands)] = ip
+
+            if not future_to_ip:
+                break
+
+            # As each task completes, collect the result and tell the breaker
+            done, _ = concurrent.futures.wait(future_to_ip, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ip = future_to_ip.pop(future)
+                try:
+                    result_row, succeeded = future.result()
+                except Exception as e:
+                    print(f"Error processing {ip}: {e}")
+                    result_row, succeeded = [ip] + [f"Error: {str(e)}"] * len(commands), False
+                breaker.record(ip, succeeded)
+                results.append(result_row)
+
+    return results
+
+# Main function to tie everything together
+def main(input_csv, output_csv, max_workers=40):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Sweep TCP/22 on every device in a few seconds
+    reachable = asyncio.run(preflight_sweep(devices))
+    unreachable = [ip for ip in devices if ip not in reachable]
+    print(f"Preflight: {len(reachable)} reachable, {len(unreachable)} unreachable on TCP/22")
+
+    # Step 3: Report the dead hosts straight away instead of waiting on SSH timeouts
+    results = [[ip] + ["Error: TCP/22 unreachable (preflight)"] * len(commands) for ip in unreachable]
+
+    # Step 4: Run SSH only against reachable devices, with a breaker per /24
+    breaker = SubnetCircuitBreaker(failure_threshold=5)
+    results += run_concurrent_tasks([ip for ip in devices if ip in reachable], commands, breaker, max_workers)
+
+    # Step 5: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_preflight.csv'  # Output file for results
+    main(input_csv, output_csv, max_workers=40)
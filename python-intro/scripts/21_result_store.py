@@ -0,0 +1,226 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to hash, compress and store outputs
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+import zlib
+
+# zstandard compresses better and faster than zlib, but it is optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# A content-addressed store: every unique output is saved once, named by its hash.
+# Each (run, device, command) only stores a reference to that hash, so a banner
+# that is identical on 5,000 devices takes up the space of one
+class ResultStore:
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started REAL NOT NULL,
+                header TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS refs (
+                run_id TEXT NOT NULL,
+                ip TEXT NOT NULL,
+                command TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (run_id, ip, command)
+            );
+        """)
+        # Hashes we already know are stored, so we never compress the same output twice
+        self.known_hashes = {row[0] for row in self.db.execute("SELECT hash FROM blobs")}
+        if zstandard:
+            self.compressor = zstandard.ZstdCompressor(level=10)
+            self.decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data):
+        if zstandard:
+            return "zstd", self.compressor.compress(data)
+        return "zlib", zlib.compress(data, 9)
+
+    def decompress(self, codec, data):
+        if codec == "zstd":
+            if not zstandard:
+                raise RuntimeError("zstandard not installed. Run: pip install zstandard")
+            return self.decompressor.decompress(data)
+        return zlib.decompress(data)
+
+    # Record the start of a run and the CSV header it uses.
+    # The timestamp keeps run IDs in date order; the random part keeps two runs started
+    # in the same second apart. A plain INSERT means a clash fails instead of merging runs
+    def start_run(self, header):
+        run_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        self.db.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, time.time(), json.dumps(header)))
+        return run_id
+
+    # Save one output; only new content is compressed and written
+    def put(self, run_id, ip, command, output):
+        data = output.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self.known_hashes:
+            codec, compressed = self.compress(data)
+            self.db.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", (digest, codec, compressed))
+            self.known_hashes.add(digest)
+        self.db.execute("INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?)", (run_id, ip, command, digest))
+
+    # Save a whole result row in one transaction
+    def put_row(self, run_id, commands, row):
+        with self.db:
+            for command, output in zip(commands, row[1:]):
+                self.put(run_id, row[0], command, output)
+
+    # Rebuild a run as the same wide CSV that write_output_csv produces
+    def export_csv(self, run_id, file_path):
+        header = json.loads(self.db.execute("SELECT header FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0])
+        commands = header[1:]
+        outputs = {}
+        device_order = []
+        query = """
+            SELECT refs.ip, refs.command, blobs.codec, blobs.data
+            FROM refs JOIN blobs ON refs.hash = blobs.hash
+            WHERE refs.run_id = ? ORDER BY refs.rowid
+        """
+        # Decompress each unique blob only once, however many devices share it
+        decoded = {}
+        for ip, command, codec, data in self.db.execute(query, (run_id,)):
+            if ip not in outputs:
+                outputs[ip] = {}
+                device_order.append(ip)
+            key = (codec, data)
+            if key not in decoded:
+                decoded[key] = self.decompress(codec, data).decode("utf-8")
+            outputs[ip][command] = decoded[key]
+        rows = [[ip] + [outputs[ip].get(command, "") for command in commands] for ip in device_order]
+        write_output_csv(file_path, header, rows)
+
+    # How much did de-duplication and compression save?
+    def stats(self):
+        references = self.db.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        unique, stored_bytes = self.db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()
+        return {"references": references, "unique_outputs": unique, "stored_bytes": stored_bytes}
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to run devices concurrently and put every finished row in the store
+def run_concurrent_tasks(devices, commands, store, run_id, max_workers=20):
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands): ip
+            for ip in devices
+        }
+
+        # As each task completes, store it (SQLite is only used from this thread)
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+                result_row = [ip] + [f"Error: {str(e)}"] * len(commands)
+            store.put_row(run_id, commands, result_row)
+
+# Main function to tie everything together
+def main(input_csv, store_path, export_csv=None, max_workers=40):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Open the store and start a new run
+    store = ResultStore(store_path)
+    try:
+        run_id = store.start_run(header)
+
+        # Step 3: Run the tasks concurrently, storing each unique output once
+        run_concurrent_tasks(devices, commands, store, run_id, max_workers)
+
+        # Step 4: Optionally export the run back to the familiar CSV format
+        if export_csv:
+            store.export_csv(run_id, export_csv)
+
+        stats = store.stats()
+        print(f"Run {run_id}: {stats['references']} outputs stored as "
+              f"{stats['unique_outputs']} unique blobs ({stats['stored_bytes']} bytes compressed)")
+    finally:
+        store.close()
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    store_path = '../outputs/result_store.db'  # Content-addressed store shared by every run
+    export_csv = '../outputs/results_150.csv'  # Same CSV format as Part 9 (set to None to skip)
+    main(input_csv, store_path, export_csv, max_workers=40)
@@ -0,0 +1,129 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+#import hashlib to fingerprint outputs and time to label each run
+import hashlib
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to make a short fingerprint of an output.
+# Two outputs with the same fingerprint are (for all practical purposes) identical
+def fingerprint(output):
+    return hashlib.blake2b(output.encode('utf-8'), digest_size=16).hexdigest()
+
+# Function to load the previous run's manifest: {(ip, command): hash}
+def load_manifest(file_path):
+    previous = {}
+    if not os.path.exists(file_path):
+        return previous
+    with open(file_path, 'r', newline='') as manifest_file:
+        reader = csv.DictReader(manifest_file)
+        for row in reader:
+            # Devices that have never answered have no fingerprint yet
+            if row['Hash']:
+                previous[(row['IP'], row['Command'])] = row['Hash']
+    return previous
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, True
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands), False
+
+# Main function: collect everything, but only write what changed since last time
+def main(input_csv, changes_csv, manifest_path):
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Load the fingerprints from the previous run
+    previous = load_manifest(manifest_path)
+    counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'error': 0}
+
+    # Step 3: Write the new manifest to a temporary file first, so a crash
+    # part way through never leaves us with half a manifest
+    temp_manifest_path = manifest_path + '.tmp'
+    with open(changes_csv, 'w', newline='') as changes_file, \
+         open(temp_manifest_path, 'w', newline='') as manifest_file:
+        changes_writer = csv.writer(changes_file)
+        changes_writer.writerow(['Run', 'IP', 'Command', 'Output'])
+        manifest_writer = csv.writer(manifest_file)
+        manifest_writer.writerow(['IP', 'Command', 'Hash', 'Status', 'Run'])
+
+        # Step 4: Collect results for all devices, one at a time (as in Part 8)
+        for ip in devices:
+            result_row, succeeded = connect_and_run_commands(ip, commands)
+
+            for command, output in zip(commands, result_row[1:]):
+                old_hash = previous.get((ip, command))
+                if not succeeded:
+                    # Keep the last good fingerprint so the next run compares against it
+                    status, new_hash = 'error', old_hash or ''
+                else:
+                    new_hash = fingerprint(output)
+                    if old_hash is None:
+                        status = 'new'
+                    elif old_hash != new_hash:
+                        status = 'changed'
+                    else:
+                        status = 'unchanged'
+
+                # Only new and changed outputs are written in full
+                if status in ('new', 'changed'):
+                    changes_writer.writerow([run_id, ip, command, output])
+                manifest_writer.writerow([ip, command, new_hash, status, run_id])
+                counts[status] += 1
+
+    # Step 5: Swap the new manifest into place in one step
+    os.replace(temp_manifest_path, manifest_path)
+    print(f"Run {run_id}: {counts['changed']} changed, {counts['new']} new, "
+          f"{counts['unchanged']} unchanged, {counts['error']} errors")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_3_devices.csv'  # Input file containing IPs and commands
+    changes_csv = '../outputs/changes_part22.csv'  # Only the outputs that changed this run
+    manifest_path = '../outputs/manifest_part22.csv'  # Fingerprint of every output, kept between runs
+    main(input_csv, changes_csv, manifest_path)
@@ -0,0 +1,219 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to expand and de-duplicate address ranges
+import ipaddress
+import bisect
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Commands for devices that don't list their own
+DEFAULT_COMMANDS = [
+    "show clock",
+    "show ver | i Last reload reason:",
+]
+
+# Commands per device group; a row's Group column picks one of these
+GROUP_COMMANDS = {
+    "core": ["show clock", "show ver | i Last reload reason:", "show ip route summary"],
+    "access": ["show clock", "show interfaces status"],
+}
+
+# Turn an address into a number; IPv6 numbers are shifted so they never clash with IPv4
+def address_number(address):
+    return int(address) + (1 << 128 if address.version == 6 else 0)
+
+# Remembers which addresses we have already handed out.
+# Whole CIDR blocks are stored as (start, end) ranges, so a /16 costs two numbers, not 65,536
+class SeenAddresses:
+    def __init__(self):
+        self.hostnames = set()  # DNS names, lower-cased since DNS ignores case
+        self.single_addresses = set()
+        self.range_starts = []  # Sorted, non-overlapping ranges of integers
+        self.range_ends = []
+
+    def __contains__(self, address):
+        number = address_number(address)
+        if number in self.single_addresses:
+            return True
+        index = bisect.bisect_right(self.range_starts, number) - 1
+        return index >= 0 and number <= self.range_ends[index]
+
+    def add_address(self, address):
+        self.single_addresses.add(address_number(address))
+
+    # Remember every address from first to last (both included)
+    def add_range(self, first, last):
+        start, end = address_number(first), address_number(last)
+        # Merge with any ranges this block overlaps or touches
+        index = bisect.bisect_left(self.range_ends, start - 1)
+        while index < len(self.range_starts) and self.range_starts[index] <= end + 1:
+            start = min(start, self.range_starts.pop(index))
+            end = max(end, self.range_ends.pop(index))
+        self.range_starts.insert(index, start)
+        self.range_ends.insert(index, end)
+
+# Function to turn one inventory row into (ip, commands) pairs, one at a time.
+# A CIDR range like 10.1.0.0/16 is expanded lazily: addresses are made as they are needed
+# Anything that isn't an address or a range is taken to be a hostname and passed on as it is
+def expand_target(target, commands, seen):
+    try:
+        if "/" in target:
+            network = ipaddress.ip_network(target, strict=False)
+        else:
+            address = ipaddress.ip_address(target)
+    except ValueError:
+        if "/" in target:
+            print(f"Skipping invalid inventory entry: {target}")
+            return
+        # A hostname like router1.example.com: Netmiko resolves it when it connects
+        if seen is None or target.lower() not in seen.hostnames:
+            if seen is not None:
+                seen.hostnames.add(target.lower())
+            yield target, commands
+        return
+
+    if "/" not in target:
+        if seen is None or address not in seen:
+            if seen is not None:
+                seen.add_address(address)
+            yield str(address), commands
+        return
+
+    # .hosts() skips the network and broadcast addresses, and is itself a generator.
+    # Only the hosts we actually handed out count as seen, so a later entry for the
+    # network or broadcast address itself is still run
+    first = None
+    for address in network.hosts():
+        if first is None:
+            first = address
+        if seen is None or address not in seen:
+            yield str(address), commands
+    if seen is not None and first is not None:
+        seen.add_range(first, address)
+
+# Generator that streams an inventory file one device at a time.
+# Supports three formats:
+#   - a .txt file with one IP or CIDR per line (like ips.txt in Part 5)
+#   - the classic CSV from Parts 6-9: IP,command 1,command 2,...
+#   - an inventory CSV: Target,Group,Commands  (Commands separated by ';')
+def read_inventory(file_path, dedupe=True):
+    seen = SeenAddresses() if dedupe else None
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        if file_path.endswith('.txt'):
+            for line in input_file:
+                target = line.strip()
+                if target:
+                    yield from expand_target(target, DEFAULT_COMMANDS, seen)
+            return
+
+        reader = csv.reader(input_file)
+        header = next(reader)
+
+        # Classic format: the header row holds the commands for every device
+        if header[0].strip().upper() == 'IP':
+            commands = header[1:]
+            for row in reader:
+                if row and row[0].strip():
+                    yield from expand_target(row[0].strip(), commands, seen)
+            return
+
+        # Inventory format: each row says which commands it wants
+        columns = {name.strip().lower(): index for index, name in enumerate(header)}
+        for row in reader:
+            if not row or not row[columns['target']].strip():
+                continue
+            target = row[columns['target']].strip()
+            group = row[columns['group']].strip() if 'group' in columns and len(row) > columns['group'] else ''
+            own_commands = row[columns['commands']].strip() if 'commands' in columns and len(row) > columns['commands'] else ''
+            if own_commands:
+                commands = [command.strip() for command in own_commands.split(';') if command.strip()]
+            else:
+                commands = GROUP_COMMANDS.get(group, DEFAULT_COMMANDS)
+            yield from expand_target(target, commands, seen)
+
+# Function to connect to a device and run commands
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to pull devices from the inventory only as fast as workers free up,
+# writing each finished device straight to the output file
+def run_concurrent_tasks(inventory, writer, max_workers=20):
+    future_to_device = {}
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Top up to max_workers devices in flight; the rest stay unread in the file
+            while len(future_to_device) < max_workers:
+                device = next(inventory, None)
+                if device is None:
+                    break
+                ip, commands = device
+                future_to_device[executor.submit(connect_and_run_commands, ip, commands)] = device
+
+            if not future_to_device:
+                break
+
+            done, _ = concurrent.futures.wait(future_to_device, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ip, commands = future_to_device.pop(future)
+                try:
+                    result_row = future.result()
+                except Exception as e:
+                    print(f"Error processing {ip}: {e}")
+                    result_row = [ip] + [f"Error: {str(e)}"] * len(commands)
+                # Devices can have different commands, so write one row per command
+                for command, output in zip(commands, result_row[1:]):
+                    writer.writerow([ip, command, output])
+
+# Main function to tie everything together
+def main(inventory_path, output_csv, max_workers=40):
+
+    # Step 1: Open the inventory as a stream; nothing is loaded up front
+    inventory = read_inventory(inventory_path)
+
+    # Step 2: Run the devices and write each result as it finishes
+    with open(output_csv, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['IP', 'Command', 'Output'])
+        run_concurrent_tasks(inventory, writer, max_workers)
+
+    print(f"Results saved to {output_csv}")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    inventory_path = '../examples/inventory_groups.csv'  # Also accepts ips.txt or input_150_devices.csv
+    output_csv = '../outputs/results_inventory.csv'  # Output file for results
+    main(inventory_path, output_csv, max_workers=40)
@@ -0,0 +1,191 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to time devices and remember their runtimes
+import json
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Guess for a device we have never timed, when there is no history at all
+DEFAULT_RUNTIME = 10.0
+
+# How much a new measurement counts against the old average (0.5 = half and half)
+SMOOTHING = 0.5
+
+# Remembers how long each device took on earlier runs, in a small JSON file: {ip: seconds}.
+# Each new time is blended into the old one, so a single slow run doesn't change much
+class RuntimeHistory:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.runtimes = {}
+        if os.path.exists(file_path):
+            with open(file_path, 'r') as history_file:
+                self.runtimes = json.load(history_file)
+
+    # The typical (median) runtime, our guess for devices we have never timed.
+    # It sorts every runtime, so work it out once per run, not once per device
+    def typical(self):
+        if not self.runtimes:
+            return DEFAULT_RUNTIME
+        known = sorted(self.runtimes.values())
+        return known[len(known) // 2]
+
+    # How long we expect a device to take; new devices get `default` (usually typical())
+    def expected(self, ip, default):
+        return self.runtimes.get(ip, default)
+
+    def record(self, ip, seconds):
+        if ip in self.runtimes:
+            seconds = SMOOTHING * seconds + (1 - SMOOTHING) * self.runtimes[ip]
+        self.runtimes[ip] = round(seconds, 3)
+
+    # Write to a temporary file first, then swap it in, so the history is never half-written
+    def save(self):
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, 'w') as history_file:
+            json.dump(self.runtimes, history_file, indent=0, sort_keys=True)
+        os.replace(temp_path, self.file_path)
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands, timing the whole session
+def connect_and_run_commands(ip, commands):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    start = time.perf_counter()
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results, time.perf_counter() - start
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP.
+        # A timeout still costs us time, so it is measured too
+        return [ip] + [f"Error: {str(e)}"] * len(commands), time.perf_counter() - start
+
+# Function to run the slowest devices first, so they don't start last and hold up the end of the run.
+# With a deadline (seconds), devices that can't finish in the time left are skipped and
+# returned as (ip, expected seconds) pairs
+def run_scheduled_tasks(devices, commands, history, max_workers=20, deadline=None):
+    # This dictionary will store the results for all devices, by IP
+    results = {}
+    skipped = []
+    started = time.monotonic()
+
+    # Work out every device's expected runtime once, before anything runs, so the
+    # times we record during the run don't change the plan (or cost a lookup each)
+    default = history.typical()
+    expected = {ip: history.expected(ip, default) for ip in devices}
+
+    # Longest expected runtime first
+    schedule = sorted(devices, key=expected.get, reverse=True)
+    remaining = iter(schedule)
+    future_to_ip = {}
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Hand out devices only as workers free up, so each one is checked against the time left
+            while len(future_to_ip) < max_workers:
+                ip = next(remaining, None)
+                if ip is None:
+                    break
+                if deadline is not None:
+                    time_left = deadline - (time.monotonic() - started)
+                    if expected[ip] > time_left:
+                        skipped.append((ip, expected[ip]))
+                        results[ip] = [ip] + ["Error: skipped, would not finish before the deadline"] * len(commands)
+                        continue
+                future_to_ip[executor.submit(connect_and_run_commands, ip, commands)] = ip
+
+            if not future_to_ip:
+                break
+
+            # As each task completes, collect the result and remember how long it took
+            done, _ = concurrent.futures.wait(future_to_ip, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ip = future_to_ip.pop(future)
+                try:
+                    result_row, seconds = future.result()
+                    history.record(ip, seconds)
+                except Exception as e:
+                    print(f"Error processing {ip}: {e}")
+                    result_row = [ip] + [f"Error: {str(e)}"] * len(commands)
+                results[ip] = result_row
+
+    print(f"Finished in {time.monotonic() - started:.1f}s")
+    # Put the rows back in the same order as the input file
+    return [results[ip] for ip in devices], skipped
+
+# Main function to tie everything together
+def main(input_csv, output_csv, history_path, max_workers=40, deadline=None):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Load how long each device took last time
+    history = RuntimeHistory(history_path)
+
+    # Step 3: Run the tasks, slowest devices first
+    try:
+        results, skipped = run_scheduled_tasks(devices, commands, history, max_workers, deadline)
+    finally:
+        # Step 4: Save the updated runtimes for next time, even if the run was interrupted
+        history.save()
+
+    # Step 5: Write the results to an output CSV and report what didn't fit
+    write_output_csv(output_csv, header, results)
+    if skipped:
+        print(f"Skipped {len(skipped)} devices that could not finish within {deadline}s:")
+        for ip, seconds in skipped:
+            print(f"  {ip} (expected {seconds:.1f}s)")
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150.csv'  # Output file for results
+    history_path = '../outputs/device_runtimes.json'  # Runtimes remembered between runs
+    deadline = None  # e.g. 300 to stop starting devices that can't finish within 5 minutes
+    main(input_csv, output_csv, history_path, max_workers=40, deadline=deadline)
@@ -0,0 +1,252 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import paramiko (installed with Netmiko) to hold our own connections to the jump host
+import paramiko
+import threading
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# The jump host every device is reached through. Its login defaults to the device login
+bastion_host = os.getenv("BASTION_HOST")
+bastion_username = os.getenv("BASTION_USERNAME", username)
+bastion_password = os.getenv("BASTION_PASSWORD", password)
+
+# A few long-lived SSH connections to the bastion, shared by every device session.
+# Each device gets its own "channel" inside one of these connections (like `ssh -J`),
+# so the bastion does one login per connection instead of one per device
+class BastionPool:
+    def __init__(self, host, user, secret, transports=4, channels_per_transport=10, port=22, retry_after=30):
+        self.host = host
+        self.user = user
+        self.secret = secret
+        self.port = port
+        self.channels_per_transport = channels_per_transport
+        self.clients = [None] * transports
+        self.active_channels = [0] * transports
+        self.connecting = [False] * transports  # True while one thread logs in on that connection
+        # After a failed login that connection rests for retry_after seconds. If none of the
+        # connections is up, devices then fail straight away instead of each waiting out a timeout
+        self.retry_after = retry_after
+        self.unreachable_until = [0.0] * transports
+        self.last_error = None
+        # A Condition is a lock that threads can also wait on until a channel frees up
+        self.condition = threading.Condition()
+
+    # Open one connection to the bastion. This talks to the network, so never call it holding the lock
+    def connect(self, index):
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(self.host, port=self.port, username=self.user, password=self.secret,
+                       look_for_keys=False, allow_agent=False, timeout=20)
+        # Keepalives stop firewalls from silently dropping an idle connection
+        client.get_transport().set_keepalive(30)
+        print(f"Connected to bastion {self.host} (connection {index + 1})")
+        return client
+
+    def is_connected(self, index):
+        client = self.clients[index]
+        return client is not None and client.get_transport() is not None and client.get_transport().is_active()
+
+    # Pick a connection and take one of its slots. Returns (index, needs login, current client)
+    def reserve_slot(self):
+        with self.condition:
+            # Use the least busy connection that has room, isn't mid-login and isn't resting
+            # after a failed login; or wait until one does
+            while True:
+                now = time.monotonic()
+                usable = [
+                    i for i in range(len(self.clients))
+                    if not self.connecting[i] and self.active_channels[i] < self.channels_per_transport
+                    and (self.is_connected(i) or now >= self.unreachable_until[i])
+                ]
+                if usable:
+                    index = min(usable, key=lambda i: self.active_channels[i])
+                    break
+                # Nothing is up and nothing is logging in: the bastion is down, so fail fast
+                if not self.any_connection_up():
+                    raise ConnectionError(f"Bastion {self.host} is unreachable: {self.last_error}")
+                # Wait for a free slot, a finished login, or the end of a rest period
+                resting = [until - now for until in self.unreachable_until if until > now]
+                self.condition.wait(timeout=min(resting) if resting else None)
+            # Take the slot now; if the connection needs (re-)opening, the caller does it without the lock
+            self.active_channels[index] += 1
+            must_connect = not self.is_connected(index)
+            if must_connect:
+                self.connecting[index] = True
+            return index, must_connect, self.clients[index]
+
+    # Is any connection logged in, or logging in right now? (the caller must hold the lock)
+    def any_connection_up(self):
+        return any(self.connecting[i] or self.is_connected(i) for i in range(len(self.clients)))
+
+    # Get a channel through the bastion to ip:port. Returns (index, channel)
+    def open_channel(self, ip, port):
+        while True:
+            index, must_connect, client = self.reserve_slot()
+            if not must_connect:
+                break
+            if client:
+                client.close()
+            try:
+                client = self.connect(index)
+            except Exception as e:
+                with self.condition:
+                    self.connecting[index] = False
+                    self.active_channels[index] -= 1
+                    self.last_error = e
+                    # Only this connection rests; the others carry on
+                    self.unreachable_until[index] = time.monotonic() + self.retry_after
+                    others_up = self.any_connection_up()
+                    # Wake everyone waiting: they move to another connection, or fail fast if none is up
+                    self.condition.notify_all()
+                if others_up:
+                    print(f"Bastion connection {index + 1} failed ({e}), using another one")
+                    continue
+                raise
+            with self.condition:
+                self.clients[index] = client
+                self.connecting[index] = False
+                self.unreachable_until[index] = 0.0
+                self.condition.notify_all()
+            break
+
+        try:
+            channel = client.get_transport().open_channel("direct-tcpip", (ip, port), ("127.0.0.1", 0), timeout=20)
+            return index, channel
+        except Exception:
+            self.release(index)
+            raise
+
+    # Give a channel slot back and wake up one waiting thread
+    def release(self, index):
+        with self.condition:
+            self.active_channels[index] -= 1
+            self.condition.notify()
+
+    def close_all(self):
+        with self.condition:
+            for client in self.clients:
+                if client:
+                    client.close()
+            self.clients = [None] * len(self.clients)
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write results to an output CSV file
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        writer.writerows(rows)
+
+# Function to connect to a device and run commands.
+# With a bastion pool, the SSH session runs inside a channel through the jump host
+def connect_and_run_commands(ip, commands, bastion=None):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    channel_index, channel = None, None
+    # Attempt to connect and run commands
+    try:
+        if bastion:
+            # Netmiko accepts any socket-like object, and a paramiko channel is one
+            channel_index, channel = bastion.open_channel(ip, cisco_router['port'])
+            cisco_router['sock'] = channel
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+
+        # Run each command and collect the results
+        ip_results = [ip]  # Start with the IP in the first column
+        for command in commands:
+            result = ssh.send_command(command)
+            ip_results.append(result.strip())  # Strip extra spaces/newlines
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+    finally:
+        # Always hand the channel slot back, even when the device failed
+        if channel is not None:
+            channel.close()
+            bastion.release(channel_index)
+
+# Function to handle concurrent execution of device connections
+def run_concurrent_tasks(devices, commands, bastion=None, max_workers=20):
+    # This list will store the results for all devices
+    results = []
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands, bastion): ip
+            for ip in devices
+        }
+
+        # As each task completes, collect the result
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+                results.append(result_row)
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Main function to tie everything together
+def main(input_csv, output_csv, transports=4, channels_per_transport=10):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Set up the shared bastion connections (or go direct if no bastion is set)
+    bastion = None
+    if bastion_host:
+        bastion = BastionPool(bastion_host, bastion_username, bastion_password,
+                              transports, channels_per_transport)
+
+    # Step 3: Run the tasks concurrently; one worker per available channel
+    try:
+        results = run_concurrent_tasks(devices, commands, bastion, max_workers=transports * channels_per_transport)
+    finally:
+        if bastion:
+            bastion.close_all()
+
+    # Step 4: Write the results to an output CSV
+    write_output_csv(output_csv, header, results)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150_bastion.csv'  # Output file for results
+    main(input_csv, output_csv, transports=4, channels_per_transport=10)
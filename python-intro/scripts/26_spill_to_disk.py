@@ -0,0 +1,252 @@
+import csv
+from netmiko import ConnectHandler
+from dotenv import load_dotenv
+import os
+import concurrent.futures
+#import the tools we need to read output in pieces and park big outputs on disk
+import shutil
+import tempfile
+import time
+
+load_dotenv()
+
+device_type = "cisco_ios"
+username = os.getenv("USERNAME9")
+password = os.getenv("PASSWORD9")
+
+# Outputs bigger than this many characters are moved to a file instead of kept in memory
+SPILL_THRESHOLD = 1024 * 1024
+
+# How many characters to copy at a time when streaming a file into the CSV
+CHUNK_SIZE = 64 * 1024
+
+# A big output that lives in a file on disk. Only the path and size are kept in memory
+class SpilledOutput:
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+# Collects one command's output piece by piece. Small outputs stay in memory;
+# once the output passes the threshold, everything moves to a file and the rest is appended there.
+# (Like tempfile.SpooledTemporaryFile, but the file is closed when done, so 10,000 big
+# outputs don't use up 10,000 open file handles while they wait to be written)
+class OutputSpool:
+    def __init__(self, spill_dir, threshold=SPILL_THRESHOLD):
+        self.spill_dir = spill_dir
+        self.threshold = threshold
+        self.chunks = []
+        self.size = 0
+        self.file = None
+
+    def write(self, text):
+        self.size += len(text)
+        if self.file:
+            self.file.write(text)
+            return
+        self.chunks.append(text)
+        if self.size > self.threshold:
+            self.file = tempfile.NamedTemporaryFile('w', dir=self.spill_dir, suffix='.txt',
+                                                    encoding='utf-8', delete=False)
+            self.file.write("".join(self.chunks))
+            self.chunks = []
+
+    # Return the output as a normal string, or as a SpilledOutput if it went to disk
+    def finish(self):
+        if self.file:
+            self.file.close()
+            return SpilledOutput(self.file.name, self.size)
+        return "".join(self.chunks)
+
+    # Throw away a half-read output (for example after a timeout)
+    def discard(self):
+        if self.file:
+            self.file.close()
+            os.remove(self.file.name)
+        self.chunks = []
+
+# Function to run one command and pass its output to the spool as it arrives,
+# instead of waiting for one huge string like send_command does.
+# The echoed command and the final prompt are dropped, and the text is trimmed like .strip()
+def send_command_streaming(ssh, command, prompt, spool, timeout=120):
+    ssh.write_channel(command + "\n")
+    pending = ""  # Text we have read but not yet passed on
+    echo_removed = False
+    # Hold back enough text that a prompt split across two reads is still recognised
+    hold_back = len(prompt) + 256
+    deadline = time.monotonic() + timeout
+
+    while True:
+        chunk = ssh.read_channel()
+        if not chunk:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No output from '{command}' for {timeout} seconds")
+            time.sleep(0.05)
+            continue
+        # Output is still arriving, so give it more time
+        deadline = time.monotonic() + timeout
+        pending += chunk.replace("\r", "")
+
+        # The first line is the device echoing our command back
+        if not echo_removed:
+            if "\n" not in pending:
+                continue
+            first_line, rest = pending.split("\n", 1)
+            if command in first_line:
+                pending = rest
+            echo_removed = True
+        # Drop blank lines at the very start, like .strip() would
+        if spool.size == 0:
+            pending = pending.lstrip()
+
+        # Finished when the buffer ends with the prompt at the start of a line
+        text = pending.rstrip()
+        if text.endswith(prompt) and (len(text) == len(prompt) or text[-len(prompt) - 1] == "\n"):
+            spool.write(text[:-len(prompt)].rstrip())
+            return spool.finish()
+
+        if len(pending) > 2 * hold_back:
+            spool.write(pending[:-hold_back])
+            pending = pending[-hold_back:]
+
+# Function to read the input CSV file and extract IPs and commands
+def read_input_csv(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig') as input_file:
+        reader = csv.reader(input_file)
+        # Extract the first row (header) for commands
+        header = next(reader)
+        # Get commands (excluding the 'IP' column)
+        commands = header[1:]
+        # Get IP addresses (rows after the header)
+        devices = [row[0] for row in reader]
+    return devices, commands, header
+
+# Function to write one CSV cell straight from a spilled file, a chunk at a time.
+# This is the same quoting the csv module uses: wrap in quotes and double any quotes inside
+def write_spilled_field(csvfile, output):
+    csvfile.write('"')
+    with open(output.path, 'r', encoding='utf-8') as spill_file:
+        while True:
+            chunk = spill_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            csvfile.write(chunk.replace('"', '""'))
+    csvfile.write('"')
+    # The file has done its job
+    os.remove(output.path)
+
+# Function to write results to an output CSV file.
+# Normal rows go through csv.writer; rows with spilled outputs are streamed from disk
+def write_output_csv(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        # Write the header (IP + commands)
+        writer.writerow(header)
+        # Write all the results for each device
+        for row in rows:
+            if not any(isinstance(value, SpilledOutput) for value in row):
+                writer.writerow(row)
+                continue
+            for index, value in enumerate(row):
+                if index:
+                    csvfile.write(',')
+                if isinstance(value, SpilledOutput):
+                    write_spilled_field(csvfile, value)
+                else:
+                    csvfile.write('"' + value.replace('"', '""') + '"')
+            csvfile.write('\r\n')  # csv.writer's default line ending
+
+# Function to connect to a device and run commands.
+# With a spill directory, outputs are streamed and big ones end up on disk
+def connect_and_run_commands(ip, commands, spill_dir=None, spill_threshold=SPILL_THRESHOLD):
+    # Define the connection parameters for the device
+    cisco_router = {
+        'device_type': 'cisco_ios',
+        'host': ip,
+        'username': username,
+        'password': password,
+        'port': 22,
+    }
+    ip_results = [ip]  # Start with the IP in the first column
+    # Attempt to connect and run commands
+    try:
+        ssh = ConnectHandler(**cisco_router)
+        print(f"Successfully connected to {ip}")
+        prompt = ssh.find_prompt()
+
+        # Run each command and collect the results
+        for command in commands:
+            if spill_dir is None:
+                result = ssh.send_command(command)
+                ip_results.append(result.strip())  # Strip extra spaces/newlines
+                continue
+            spool = OutputSpool(spill_dir, spill_threshold)
+            try:
+                ip_results.append(send_command_streaming(ssh, command, prompt, spool))
+            except Exception:
+                spool.discard()
+                raise
+
+        # Disconnect after running commands
+        ssh.disconnect()
+        return ip_results
+    except Exception as e:
+        print(f"Failed to connect to {ip}: {str(e)}")
+        # Remove any files this device already spilled; its row is all errors now
+        for value in ip_results:
+            if isinstance(value, SpilledOutput):
+                os.remove(value.path)
+        # Return the error message in place of results for this IP
+        return [ip] + [f"Error: {str(e)}"] * len(commands)
+
+# Function to handle concurrent execution of device connections
+def run_concurrent_tasks(devices, commands, spill_dir=None, spill_threshold=SPILL_THRESHOLD, max_workers=20):
+    # This list will store the results for all devices
+    results = []
+
+    # Use ThreadPoolExecutor to run tasks concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Create a dictionary to store future tasks
+        future_to_ip = {
+            executor.submit(connect_and_run_commands, ip, commands, spill_dir, spill_threshold): ip
+            for ip in devices
+        }
+
+        # As each task completes, collect the result
+        for future in concurrent.futures.as_completed(future_to_ip):
+            ip = future_to_ip[future]
+            try:
+                result_row = future.result()
+                results.append(result_row)
+            except Exception as e:
+                print(f"Error processing {ip}: {e}")
+
+    return results
+
+# Main function to tie everything together.
+# spill_threshold=None turns spilling off and keeps every output in memory (like Part 9)
+def main(input_csv, output_csv, max_workers=40, spill_threshold=SPILL_THRESHOLD):
+
+    # Step 1: Read the input CSV to get IPs and commands
+    devices, commands, header = read_input_csv(input_csv)
+
+    # Step 2: Make a private folder for big outputs, next to the output file
+    spill_dir = None
+    if spill_threshold is not None:
+        spill_dir = tempfile.mkdtemp(prefix='spill_', dir=os.path.dirname(os.path.abspath(output_csv)))
+
+    try:
+        # Step 3: Run the tasks concurrently
+        results = run_concurrent_tasks(devices, commands, spill_dir, spill_threshold, max_workers)
+
+        # Step 4: Write the results to an output CSV, streaming the spilled outputs
+        write_output_csv(output_csv, header, results)
+    finally:
+        # Step 5: Clean up, even if something went wrong
+        if spill_dir:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+# Run the main function if this script is executed directly
+if __name__ == "__main__":
+    input_csv = '../examples/input_150_devices.csv'  # Input file containing IPs and commands
+    output_csv = '../outputs/results_150.csv'  # Output file for results
+    main(input_csv, output_csv, max_workers=40, spill_threshold=SPILL_THRESHOLD)
@@ -0,0 +1,200 @@
+import csv
+import os
+#import the tools we need for the search index and the command line
+import argparse
+import hashlib
+import sqlite3
+import sys
+import time
+
+# Outputs like "show tech-support" can be far bigger than the csv module's default cell limit
+csv.field_size_limit(2**31 - 1)
+
+# A full-text index over collected outputs, in one SQLite file.
+# SQLite's FTS5 extension splits every output into words and keeps a list of where
+# each word appears, so a search never has to read the outputs themselves.
+# Like Part 21, each unique output is indexed once, however many devices or runs share it
+class SearchIndex:
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5(output);
+            CREATE TABLE IF NOT EXISTS text_hashes (
+                hash TEXT PRIMARY KEY,
+                text_id INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                indexed REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                run_id TEXT NOT NULL,
+                ip TEXT NOT NULL,
+                command TEXT NOT NULL,
+                text_id INTEGER NOT NULL,
+                PRIMARY KEY (run_id, ip, command)
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_text ON entries (text_id);
+        """)
+
+    def has_run(self, run_id):
+        return self.db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+    # Find an output in the index, adding it if we have never seen it
+    def text_id_for(self, output):
+        digest = hashlib.sha256(output.encode("utf-8")).hexdigest()
+        row = self.db.execute("SELECT text_id FROM text_hashes WHERE hash = ?", (digest,)).fetchone()
+        if row:
+            return row[0]
+        text_id = self.db.execute("INSERT INTO texts (output) VALUES (?)", (output,)).lastrowid
+        self.db.execute("INSERT INTO text_hashes VALUES (?, ?)", (digest, text_id))
+        return text_id
+
+    # Add one run's results in a single transaction. Runs already in the index are left alone
+    def add_run(self, run_id, source, results):
+        added = 0
+        with self.db:
+            self.db.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, source, time.time()))
+            for ip, command, output in results:
+                self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                                (run_id, ip, command, self.text_id_for(output)))
+                added += 1
+        return added
+
+    def latest_run(self):
+        row = self.db.execute("SELECT run_id FROM runs ORDER BY indexed DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def list_runs(self):
+        query = """
+            SELECT runs.run_id, runs.source, COUNT(entries.ip)
+            FROM runs LEFT JOIN entries ON entries.run_id = runs.run_id
+            GROUP BY runs.run_id ORDER BY runs.indexed
+        """
+        return self.db.execute(query).fetchall()
+
+    # Search with FTS5 syntax: words, "exact phrases", AND / OR / NOT, prefix*
+    # (plain words from the command line go through quote_terms first)
+    def search(self, query, run_id=None, command=None, limit=50):
+        sql = """
+            SELECT entries.run_id, entries.ip, entries.command,
+                   snippet(texts, 0, '[', ']', '...', 12)
+            FROM texts JOIN entries ON entries.text_id = texts.rowid
+            WHERE texts MATCH ?
+        """
+        params = [query]
+        if run_id:
+            sql += " AND entries.run_id = ?"
+            params.append(run_id)
+        if command:
+            sql += " AND entries.command = ?"
+            params.append(command)
+        sql += " ORDER BY entries.run_id DESC, entries.ip LIMIT ?"
+        params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+
+    def close(self):
+        self.db.close()
+
+# Function to turn plain words into an FTS5 query that finds all of them.
+# Each word is quoted, so values like "power-on" or "Gi0/1" aren't read as FTS5 syntax
+# (a bare power-on means "power, but not the column on"). A trailing * still matches a prefix
+def quote_terms(query):
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*') and len(word) > 1
+        if prefix:
+            word = word[:-1]
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+# Generator that reads a results CSV as (ip, command, output), one cell at a time.
+# Works with the wide CSV from Parts 8-9 (IP, command 1, command 2, ...)
+# and the long CSV from Part 23 (IP, Command, Output)
+def read_results(file_path):
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as results_file:
+        reader = csv.reader(results_file)
+        header = next(reader)
+        long_format = [name.strip() for name in header] == ['IP', 'Command', 'Output']
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            if long_format:
+                yield row[0], row[1], row[2]
+            else:
+                for command, output in zip(header[1:], row[1:]):
+                    yield row[0], command, output
+
+# Function to index one results file as a run.
+# The run ID defaults to the file's modification time, so re-indexing the same file does nothing
+def index_results(index, results_csv, run_id=None):
+    if run_id is None:
+        run_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(os.path.getmtime(results_csv)))
+    if index.has_run(run_id):
+        print(f"Run {run_id} is already indexed, skipping {results_csv}")
+        return
+    start = time.perf_counter()
+    added = index.add_run(run_id, os.path.abspath(results_csv), read_results(results_csv))
+    print(f"Indexed {added} outputs from {results_csv} as run {run_id} in {time.perf_counter() - start:.2f}s")
+
+# Function to print the devices whose output matches a query.
+# With raw=True the query is passed to FTS5 as it is, for AND / OR / NOT and "phrases"
+def search_index(index, query, run_id=None, command=None, all_runs=False, limit=50, raw=False):
+    # By default only the newest run is searched: "which devices have X right now?"
+    if run_id is None and not all_runs:
+        run_id = index.latest_run()
+    if not query.strip():
+        print("Nothing to search for")
+        return
+    start = time.perf_counter()
+    try:
+        matches = index.search(query if raw else quote_terms(query), run_id, command, limit)
+    except sqlite3.OperationalError as e:
+        print(f"Invalid search '{query}': {e}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    for match_run, ip, match_command, snippet in matches:
+        print(f"{match_run}  {ip:<16} {match_command}: {' '.join(snippet.split())}")
+    print(f"{len(matches)} matches in {elapsed:.1f} ms")
+
+# Main function: a small command line with three sub-commands
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search over collected command outputs")
+    parser.add_argument('--db', default='../outputs/search_index.db', help="Index file (created if missing)")
+    subcommands = parser.add_subparsers(dest='action', required=True)
+
+    index_parser = subcommands.add_parser('index', help="Add a results CSV to the index")
+    index_parser.add_argument('results_csv', help="Output CSV from any of the collection scripts")
+    index_parser.add_argument('--run', help="Run ID to store it under (default: the file's timestamp)")
+
+    search_parser = subcommands.add_parser('search', help="Find devices whose output matches a query")
+    search_parser.add_argument('query', help="Words that must all appear, e.g. 'power-on' or 'reload 15*'")
+    search_parser.add_argument('--raw', action='store_true',
+                               help='Treat the query as FTS5 syntax, e.g. \'"reload command" OR power*\'')
+    search_parser.add_argument('--command', help="Only search the output of this command")
+    search_parser.add_argument('--run', help="Only search this run (default: the newest run)")
+    search_parser.add_argument('--all-runs', action='store_true', help="Search every run")
+    search_parser.add_argument('--limit', type=int, default=50, help="Maximum number of matches to show")
+
+    subcommands.add_parser('runs', help="List the indexed runs")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.db)
+    try:
+        if args.action == 'index':
+            index_results(index, args.results_csv, args.run)
+        elif args.action == 'search':
+            search_index(index, args.query, args.run, args.command, args.all_runs, args.limit, args.raw)
+        else:
+            for run_id, source, outputs in index.list_runs():
+                print(f"{run_id}  {outputs:>7} outputs  {source}")
+    finally:
+        index.close()
+
+# Run the main function if this script is executed directly, e.g.:
+#   python 27_search_index.py index ../outputs/results_150.csv
+#   python 27_search_index.py search power-on
+#   python 27_search_index.py search --raw '"reload command"' --command "show ver | i Last reload reason:"
+if __name__ == "__main__":
+    main(sys.argv[1:])